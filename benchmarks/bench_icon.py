@@ -0,0 +1,70 @@
+"""
+Benchmark the mip-chain resampling pipeline of `clickx icon` against the former
+path, which lets Pillow resample each icon size from the full resolution source.
+
+    python benchmarks/bench_icon.py [SIZE]
+"""
+
+import sys
+import tempfile
+import time
+import typing as t
+from pathlib import Path
+
+from PIL import Image
+
+from clickx.imaging import frames
+
+SIZES = (16, 32, 48, 64, 128, 256)
+
+
+def legacy(picture: Path, icon: Path) -> None:
+    img = Image.open(picture)
+    img.save(icon, format="ICO", sizes=[(s, s) for s in SIZES])
+
+
+def pipeline(picture: Path, icon: Path, fast: bool = False) -> None:
+    img = Image.open(picture)
+    icons = frames(img, SIZES, fast=fast)
+    icons[0].save(
+        icon,
+        format="ICO",
+        sizes=[i.size for i in icons],
+        append_images=icons[1:],
+    )
+
+
+def bench(func: t.Callable[[], None], repeat: int = 3) -> float:
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings) * 1e3
+
+
+def main(size: int = 8192) -> None:
+
+    with tempfile.TemporaryDirectory() as temp:
+        icon = Path(temp, "icon.ico")
+
+        for suffix in (".png", ".jpg"):
+            picture = Path(temp, "picture").with_suffix(suffix)
+            Image.effect_mandelbrot((size, size), (-2, -1.5, 1, 1.5), 100).convert(
+                "RGB"
+            ).save(picture)
+
+            print(f"{size}x{size} {suffix}")
+
+            for name, func in (
+                ("legacy", lambda: legacy(picture, icon)),
+                ("mip-chain", lambda: pipeline(picture, icon)),
+                ("mip-chain --fast", lambda: pipeline(picture, icon, True)),
+            ):
+                print(f"  {name:18} {bench(func):9.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,81 @@
+"""
+Benchmark the writer backends of `clickx.redirect` in lines per second, on a local
+file and on a simulated slow file system with a fixed latency per write call.
+
+    python benchmarks/bench_redirect.py [LINES] [LATENCY_MS]
+"""
+
+import io
+import sys
+import tempfile
+import time
+import typing as t
+from pathlib import Path
+from unittest import mock
+
+import click
+
+import clickx
+
+
+class SlowFileIO(io.FileIO):
+    """Raw file with a latency on each write, e.g. like a network file system."""
+
+    latency = 0.0
+
+    def write(self, b):
+        time.sleep(self.latency)
+        return super().write(b)
+
+    def fileno(self):
+        raise io.UnsupportedOperation("fileno")
+
+
+def slow_open(self, value, param, ctx):
+    raw = SlowFileIO(value, "w")
+    stream = io.TextIOWrapper(io.BufferedWriter(raw), encoding="utf-8")
+    ctx.call_on_close(stream.close)
+
+    return stream
+
+
+def command(writer: t.Optional[str], lines: int) -> click.Command:
+
+    @click.command()
+    @clickx.redirect(writer=writer)
+    def cli():
+        for i in range(lines):
+            print(f"line {i:>10} of the redirect benchmark")
+
+    return cli
+
+
+def bench(file: Path, lines: int) -> None:
+
+    for writer in (None, "buffered", "thread"):
+        cli = command(writer, lines)
+
+        start = time.perf_counter()
+        cli.main(["--redirect", str(file)], standalone_mode=False)
+        elapsed = time.perf_counter() - start
+
+        print(f"  writer={writer!s:9} {lines / elapsed:12,.0f} lines/s")
+
+
+def main(lines: int = 1_000_000, latency: float = 0.5) -> None:
+
+    with tempfile.TemporaryDirectory() as temp:
+        file = Path(temp, "redirect.txt")
+
+        print("local file")
+        bench(file, lines)
+
+        print(f"slow file system, {latency} ms per write")
+        SlowFileIO.latency = latency / 1e3
+
+        with mock.patch.object(click.File, "convert", slow_open):
+            bench(file, lines)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) if arg.isdigit() else float(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,89 @@
+"""
+Benchmark `clickx.sitepackage` against the former list materializing resolver on a
+synthetic distribution with a 50k-entry RECORD.
+
+    python benchmarks/bench_sitepackage.py
+"""
+
+import importlib.metadata
+import sys
+import tempfile
+import timeit
+import typing as t
+from pathlib import Path
+
+from clickx.sitepackage import _sitepackage_dir
+
+DISTRIBUTION = "vendored-sdk"
+ENTRIES = 50_000
+PACKAGES = 1_000
+
+
+def legacy(distribution_name: str) -> Path:
+    """Former strategy, locates every top-level package before taking the first."""
+
+    files = [
+        file.locate()
+        for file in importlib.metadata.files(distribution_name) or []
+        if file.name == "__init__.py"
+        and len(file.parts) == 2
+        and file.parts[0].lower() != "tests"
+    ]
+
+    return Path(files[0]).parent
+
+
+def distribution(site: Path, top_level: bool) -> None:
+    """Creates the synthetic distribution in a site directory."""
+
+    info = site.joinpath("vendored_sdk-1.0.dist-info")
+    info.mkdir(parents=True)
+    info.joinpath("METADATA").write_text(f"Name: {DISTRIBUTION}\nVersion: 1.0\n")
+
+    records = [f"vendored{i}/__init__.py,," for i in range(PACKAGES)]
+    records += [
+        f"vendored0/module{i}/file.py,sha256=abc,1" for i in range(ENTRIES - PACKAGES)
+    ]
+    info.joinpath("RECORD").write_text("\n".join(records))
+
+    if top_level:
+        names = (f"vendored{i}" for i in range(PACKAGES))
+        info.joinpath("top_level.txt").write_text("\n".join(names))
+
+    package = site.joinpath("vendored0")
+    package.mkdir()
+    package.joinpath("__init__.py").touch()
+
+
+def bench(func: t.Callable[[str], Path], number: int) -> float:
+    return min(timeit.repeat(lambda: func(DISTRIBUTION), number=number, repeat=3))
+
+
+def main(number: int = 5) -> None:
+
+    for top_level in (False, True):
+        with tempfile.TemporaryDirectory() as temp:
+            site = Path(temp)
+            distribution(site, top_level)
+
+            sys.path.insert(0, str(site))
+            importlib.invalidate_caches()
+
+            try:
+                assert legacy(DISTRIBUTION) == _sitepackage_dir(DISTRIBUTION)
+
+                before = bench(legacy, number) / number
+                after = bench(_sitepackage_dir, number) / number
+            finally:
+                sys.path.remove(str(site))
+
+        print(
+            f"top_level.txt={top_level!s:5}  "
+            f"legacy {before * 1e3:8.2f} ms  "
+            f"streaming {after * 1e3:8.2f} ms  "
+            f"speedup {before / after:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
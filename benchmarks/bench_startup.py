@@ -0,0 +1,182 @@
+"""
+Startup benchmarks for the short-lived invocations of `clickx`.
+
+Measures cold starts in a fresh interpreter, warm starts in the running process,
+the cumulative import cost per `clickx` module and the latency of resolving
+`version()` and `PackageIcon`. Results are compared against the stored baseline and
+the script exits with 1 if any metric regresses by more than the threshold.
+
+    python benchmarks/bench_startup.py [--update] [--threshold 0.25]
+
+Baselines are machine specific, regenerate them with `--update` before comparing
+changes on another machine.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+import typing as t
+from pathlib import Path
+
+BASELINE = Path(__file__).with_name("baseline_startup.json")
+
+COLD = {
+    "cold: python": ["-c", "pass"],
+    "cold: import clickx": ["-c", "import clickx"],
+    "cold: clickx --help": ["-m", "clickx", "--help"],
+    "cold: clickx --version": ["-m", "clickx", "--version"],
+    "cold: clickx --icon": ["-m", "clickx", "--icon"],
+}
+
+WARM = ["--help", "--version", "--icon"]
+
+MODULES = [
+    "clickx",
+    "clickx.__main__",
+    "clickx.cli",
+    "clickx.decorators",
+    "clickx.group",
+    "clickx.metadata",
+    "clickx.options",
+    "clickx.sitepackage",
+    "clickx.types",
+]
+
+
+def median(func: t.Callable[[], t.Any], repeat: int) -> float:
+    """Returns the median wall time of `func` in milliseconds."""
+
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings) * 1e3
+
+
+def cold(repeat: int) -> t.Dict[str, float]:
+    def run(args: t.List[str]) -> None:
+        subprocess.run(
+            [sys.executable, *args],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+
+    return {name: median(lambda: run(args), repeat) for name, args in COLD.items()}
+
+
+def imports() -> t.Dict[str, float]:
+    """Returns the cumulative import time of each `clickx` module in milliseconds."""
+
+    timings = {}
+
+    for module in MODULES:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        line = result.stderr.splitlines()[-1]
+        _, cumulative, _ = line.split("|")
+
+        timings[f"import: {module}"] = int(cumulative) / 1e3
+
+    return timings
+
+
+def warm(repeat: int) -> t.Dict[str, float]:
+    from click.testing import CliRunner
+
+    from clickx.__main__ import cli
+
+    runner = CliRunner()
+
+    def invoke(option: str) -> None:
+        assert runner.invoke(cli, [option]).exit_code == 0
+
+    for option in WARM:
+        invoke(option)
+
+    return {
+        f"warm: clickx {option}": median(lambda: invoke(option), repeat)
+        for option in WARM
+    }
+
+
+def resolve(repeat: int) -> t.Dict[str, float]:
+    """Returns the latency of uncached `version()` and `PackageIcon` resolution."""
+
+    import click
+    from click.testing import CliRunner
+
+    import clickx
+    from clickx import metadata
+
+    @click.command()
+    @clickx.icon("clickx.ico", "click_tools")
+    @clickx.version("click_tools")
+    def cli():
+        pass
+
+    runner = CliRunner()
+
+    def invoke(option: str) -> None:
+        metadata.cache_clear()
+
+        assert runner.invoke(cli, [option]).exit_code == 0
+
+    return {
+        "resolve: version()": median(lambda: invoke("--version"), repeat),
+        "resolve: PackageIcon": median(lambda: invoke("--icon"), repeat),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--update", action="store_true", help="store new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    results = {
+        **cold(args.repeat),
+        **imports(),
+        **warm(args.repeat),
+        **resolve(args.repeat),
+    }
+
+    if args.update or not BASELINE.is_file():
+        BASELINE.write_text(json.dumps(results, indent=2) + "\n")
+
+    baseline = json.loads(BASELINE.read_text())
+    regressions = []
+
+    for name, value in results.items():
+        reference = baseline.get(name)
+
+        if reference is None:
+            print(f"{name:40} {value:9.2f} ms")
+            continue
+
+        change = value / reference - 1 if reference else 0.0
+        print(f"{name:40} {value:9.2f} ms {change:+8.1%}")
+
+        if change > args.threshold:
+            regressions.append(name)
+
+    for name in regressions:
+        print(f"regression: {name} exceeds threshold of {args.threshold:.0%}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
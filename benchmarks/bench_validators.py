@@ -0,0 +1,66 @@
+"""
+Benchmark `clickx.validators.batch()` against the per value `click.ParamType` of
+`clicktypes` on 50k values of a `multiple=True` option, 4 times each.
+
+    python benchmarks/bench_validators.py
+"""
+
+import random
+import timeit
+import typing as t
+import uuid
+
+from clickx import validators
+
+VALUES = 50_000
+
+
+def samples(name: str) -> t.List[str]:
+    """Returns random valid values with duplicates for a validator."""
+
+    rng = random.Random(0)
+    unique = VALUES // 4
+
+    if name == "email":
+        pool = [f"user{i}@host{i % 100}.example.com" for i in range(unique)]
+    else:
+        pool = [uuid.UUID(int=rng.getrandbits(128)).hex for _ in range(unique)]
+
+    return [rng.choice(pool) for _ in range(VALUES)]
+
+
+def per_value(name: str, values: t.List[str]) -> None:
+    """Converts each value like click does for a `multiple=True` option."""
+
+    param_type = getattr(validators, name)()
+
+    for value in values:
+        param_type.convert(value, None, None)
+
+
+def batched(name: str, values: t.List[str]) -> None:
+    assert not validators.batch(name).invalid(values)
+
+
+def bench(func: t.Callable[[str, t.List[str]], None], name: str, number: int) -> float:
+    values = samples(name)
+
+    return min(timeit.repeat(lambda: func(name, values), number=number, repeat=3))
+
+
+def main(number: int = 3) -> None:
+
+    for name in ("md5", "email"):
+        before = bench(per_value, name, number) / number
+        after = bench(batched, name, number) / number
+
+        print(
+            f"{name:6} {VALUES} values  "
+            f"per value {before * 1e3:8.2f} ms  "
+            f"batch {after * 1e3:8.2f} ms  "
+            f"speedup {before / after:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
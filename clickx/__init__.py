@@ -1,13 +1,67 @@
-from .decorators import redirect
-from .decorators import traceback
-from .options import icon
-from .options import version
-from .types import PackageIcon
+import importlib
+import typing as t
+
+if t.TYPE_CHECKING:
+    from .aio import gather
+    from .decorators import asynchronous
+    from .decorators import parallel
+    from .decorators import profile
+    from .decorators import redirect
+    from .decorators import timings
+    from .decorators import traceback
+    from .group import LazyGroup
+    from .options import icon
+    from .options import version
+    from .types import MappedFile
+    from .types import PackageIcon
+    from .types import StreamFile
+
+_exports = {
+    "asynchronous": "decorators",
+    "gather": "aio",
+    "parallel": "decorators",
+    "profile": "decorators",
+    "redirect": "decorators",
+    "timings": "decorators",
+    "traceback": "decorators",
+    "LazyGroup": "group",
+    "MappedFile": "types",
+    "PackageIcon": "types",
+    "StreamFile": "types",
+    "version": "options",
+    "icon": "options",
+}
 
 __all__ = [
+    "asynchronous",
+    "gather",
+    "parallel",
+    "profile",
     "redirect",
+    "timings",
     "traceback",
+    "LazyGroup",
+    "MappedFile",
     "PackageIcon",
+    "StreamFile",
     "version",
     "icon",
 ]
+
+
+def __getattr__(name: str) -> t.Any:
+    """Imports the exported names lazily on first access."""
+
+    try:
+        module = _exports[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> t.List[str]:
+    return sorted({*globals(), *__all__})
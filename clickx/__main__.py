@@ -1,17 +1,22 @@
 import click
 
 import clickx
-from clickx.cli import cli_icon
 
 
-@click.group()
+@click.group(
+    cls=clickx.LazyGroup,
+    lazy_subcommands={
+        "daemon": "clickx.daemon.cli_daemon",
+        "icon": "clickx.cli.cli_icon",
+        "resources": "clickx.cli.cli_resources",
+        "snapshot": "clickx.cli.cli_snapshot",
+    },
+)
 @clickx.icon("clickx.ico", "click_tools")
 @clickx.version("click_tools")
 def cli() -> None:
     pass
 
 
-cli.add_command(cli_icon, name="icon")
-
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,62 @@
+import asyncio
+import contextvars
+import typing as t
+
+T = t.TypeVar("T")
+
+# default limit of concurrent awaitables in `gather()`, set per command run
+concurrency: contextvars.ContextVar[t.Optional[int]] = contextvars.ContextVar(
+    "concurrency", default=None
+)
+
+
+def run(
+    coro: t.Coroutine[t.Any, t.Any, T],
+    limit: t.Optional[int] = None,
+    debug: bool = False,
+) -> T:
+    """
+    Runs a coroutine on a new event loop and closes it afterwards. On
+    `KeyboardInterrupt` all pending tasks are cancelled and awaited, before the
+    interrupt is raised again.
+    """
+
+    token = concurrency.set(limit)
+
+    try:
+        return asyncio.run(coro, debug=debug)
+    finally:
+        concurrency.reset(token)
+
+
+async def gather(
+    *aws: t.Awaitable[T],
+    limit: t.Optional[int] = None,
+) -> t.List[T]:
+    """
+    Awaits all awaitables with at most `limit` running at once, defaults to the
+    `--concurrency` of the command, and returns their results in order. If one
+    fails, the others are cancelled and the exception is raised.
+    """
+
+    limit = limit or concurrency.get()
+
+    if limit:
+        semaphore = asyncio.Semaphore(limit)
+
+        async def bounded(aw: t.Awaitable[T]) -> T:
+            async with semaphore:
+                return await aw
+
+        aws = tuple(bounded(aw) for aw in aws)
+
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
@@ -0,0 +1,91 @@
+import hashlib
+import os
+import time
+import typing as t
+from pathlib import Path
+
+
+class IconCache:
+    """
+    Persistent content addressed cache for encoded icons.
+
+    Entries are stored as files named by their key, the modification time of each
+    file records its last usage. Least recently used entries are evicted as soon as
+    the total size exceeds `max_size` bytes. There is no shared index, so processes
+    can use the same cache directory concurrently.
+    """
+
+    def __init__(self, directory: t.Union[str, Path], max_size: int = 64 * 2**20):
+        self._directory = Path(directory)
+        self._max_size = max_size
+
+    @staticmethod
+    def key(source: bytes, *parts: t.Any) -> str:
+        """Returns the cache key for the source content and additional parameters."""
+
+        digest = hashlib.sha256(source)
+        digest.update(repr(parts).encode())
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def _touch(file: Path) -> None:
+        now = time.time_ns()
+
+        try:
+            os.utime(file, ns=(now, now))
+        except OSError:
+            pass
+
+    def get(self, key: str) -> t.Optional[bytes]:
+        """Returns the cached content for key or `None` on a cache miss."""
+
+        file = self._directory.joinpath(key)
+
+        try:
+            data = file.read_bytes()
+        except OSError:
+            return None
+
+        self._touch(file)
+
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Stores the content for key and evicts entries exceeding the size limit."""
+
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+        file = self._directory.joinpath(key)
+        temp = self._directory.joinpath(f".{key}.{os.getpid()}")
+
+        temp.write_bytes(data)
+        os.replace(temp, file)
+        self._touch(file)
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes least recently used entries until the size limit is satisfied."""
+
+        entries = []
+
+        for entry in os.scandir(self._directory):
+            if entry.name.startswith("."):
+                continue
+
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+
+            entries.append((st.st_mtime_ns, st.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total <= self._max_size:
+                break
+
+            total -= size
+            Path(path).unlink(missing_ok=True)
@@ -1,34 +1,174 @@
+import concurrent.futures as cf
+import contextlib as cl
+import glob
+import io
+import os
 import typing as t
 from pathlib import Path
 
 import click
 
+from . import jsonfile
+from . import metadata
+from .cache import IconCache
+from .decorators import timings
 from .decorators import traceback
+from .imaging import encode
+from .imaging import frames
+from .imaging import ICNS_SIZES
+from .imaging import load
+from .imaging import outputs
+from .imaging import RESAMPLING
+from .instrumentation import peak_rss
+from .instrumentation import phase
+from .manifest import digest
+from .manifest import file_digest
+from .manifest import Manifest
+from .manifest import outdated
+from .resources import RESOURCES
+from .resources import ResourceIndex
+
+SIZES = (64, 128, 256)
+
+SUFFIXES = (".bmp", ".gif", ".jpeg", ".jpg", ".png", ".tif", ".tiff", ".webp")
+
+
+def targets(
+    picture: Path,
+    icon: t.Union[str, t.Sequence[str], None],
+    sizes: t.Tuple[int, ...],
+) -> t.List[t.Tuple[Path, t.Optional[int]]]:
+    """
+    Returns the output files of a picture as tuples of path and size, by default a
+    `.ico` next to the picture.
+    """
+
+    paths = [Path(i) for i in ([icon] if isinstance(icon, str) else icon or [])]
+
+    return [
+        file
+        for target in paths or [picture.with_suffix(".ico")]
+        for file in outputs(target, sizes)
+    ]
 
 
 def icon(
     picture: str,
-    icon: t.Optional[str] = None,
+    icon: t.Union[str, t.Sequence[str], None] = None,
     size: t.Optional[tuple[int]] = None,
+    cache: t.Optional[str] = None,
+    cache_size: int = 64,
+    resample: str = "lanczos",
+    fast: bool = False,
+    memory_budget: t.Optional[int] = None,
+    manifest: t.Union[str, Manifest, None] = None,
+    check: bool = False,
 ) -> int:
-    """convert a image to an icon with multiple sizes."""
+    """
+    convert a image to an icon with multiple sizes.
+
+    Returns 1 if any output was written, 0 if all outputs are unchanged. With a
+    `manifest` only stale outputs are re-encoded and recorded, see
+    `clickx.manifest.Manifest`. A manifest file is saved, a `Manifest` instance is
+    only updated. With `check` the stale outputs are only printed.
+    """
 
     pic = Path(picture)
-    ico = Path(icon) if icon else pic.with_suffix(".ico")
-    siz = size if size else (64, 128, 256)
+    siz = tuple(size) if size else SIZES
+    budget = memory_budget * 2**20 if memory_budget else None
+
+    files = targets(pic, icon, siz)
+
+    options = {
+        path: IconCache.key(b"", siz, resample, fast, budget, path.suffix.lower(), s)
+        for path, s in files
+    }
+    record = Manifest(manifest) if isinstance(manifest, (str, Path)) else manifest
+
+    if record:
+        files = [
+            (path, s)
+            for path, s in files
+            if record.stale(pic, path, options[path])
+            and (check or not record.unchanged(pic, path, options[path]))
+        ]
+    elif check:
+        files = [(path, s) for path, s in files if outdated(pic, path)]
+
+    if check:
+        for path, _ in files:
+            print(str(path))
+
+        return 1 if files else 0
 
     try:
-        from PIL import Image
+        from PIL import __version__
+
+        exitcode = 0
+
+        store = IconCache(cache, cache_size * 2**20) if cache else None
+        # hash the source in chunks, reading it at once would exceed the budget
+        source = file_digest(pic) if store or record else ""
+        keys = {
+            path: IconCache.key(
+                source.encode(),
+                siz,
+                resample,
+                fast,
+                budget,
+                __version__,
+                path.suffix.lower(),
+                s,
+            )
+            for path, s in files
+        }
+        data = {path: store.get(keys[path]) if store else None for path, _ in files}
+        missing = [(path, s) for path, s in files if data[path] is None]
+
+        if missing:
+            with phase("icon.encode", picture=str(pic)):
+                lengths = set(siz)
+                if any(path.suffix.lower() == ".icns" for path, _ in missing):
+                    lengths.update(ICNS_SIZES)
 
-        exitcode = 0 if ico.is_file() else 1
+                img = load(pic, lengths, budget)
 
-        img = Image.open(pic)
-        img.save(ico, format="ICO", sizes=[(s, s) for s in siz])
+                chain = frames(img, lengths, resample, fast) or [img]
 
-        if not ico.is_file():
-            exitcode = 1
+                # the encoders copy the frames concurrently, load the picture first
+                img.load()
 
-        print(str(ico))
+                with cf.ThreadPoolExecutor() as pool:
+                    encoded = pool.map(
+                        lambda file: encode(file[0], file[1], chain, siz),
+                        missing,
+                    )
+
+                    for (path, _), content in zip(missing, encoded):
+                        data[path] = content
+
+                        if store and content is not None:
+                            store.put(keys[path], content)
+
+        for path, _ in files:
+            content = data[path]
+
+            if content is None:
+                continue
+
+            if not path.is_file() or path.read_bytes() != content:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(content)
+
+                exitcode = 1
+
+            if record:
+                record.record(pic, path, options[path], source, digest(content))
+
+            print(str(path))
+
+        if record and record is not manifest:
+            record.save()
     except ModuleNotFoundError:
         print("pip install click-tools[pillow]")
 
@@ -37,17 +177,192 @@ def icon(
     return exitcode
 
 
-@click.command(help=icon.__doc__)
+def pictures(patterns: t.Iterable[str]) -> t.List[Path]:
+    """
+    Expand files, directories and glob patterns into a list of unique pictures.
+
+    Directories are searched non-recursive for files with a suffix in `SUFFIXES`.
+    """
+
+    files: t.Dict[Path, None] = {}
+
+    for pattern in patterns:
+        path = Path(pattern)
+
+        if path.is_file():
+            matches = [path]
+        elif path.is_dir():
+            matches = sorted(
+                file
+                for file in path.iterdir()
+                if file.is_file() and file.suffix.lower() in SUFFIXES
+            )
+        else:
+            matches = sorted(
+                file
+                for file in map(Path, glob.glob(pattern, recursive=True))
+                if file.is_file()
+            )
+
+        if not matches:
+            raise FileNotFoundError(f"No pictures found for '{pattern}'.")
+
+        files.update(dict.fromkeys(matches))
+
+    return list(files)
+
+
+def _pictures(
+    ctx: click.Context,
+    param: click.Parameter,
+    value: t.Tuple[str, ...],
+) -> t.Tuple[str, ...]:
+    """Callback to expand the pictures, missing pictures are a usage error."""
+
+    try:
+        files = pictures(value)
+    except FileNotFoundError as e:
+        raise click.BadParameter(str(e), ctx, param) from e
+
+    if ctx.params.get("icon") and len(files) > 1:
+        raise click.UsageError("Option '--icon' requires a single picture.", ctx)
+
+    return tuple(map(str, files))
+
+
+def _single(
+    ctx: click.Context,
+    param: click.Parameter,
+    value: t.Tuple[str, ...],
+) -> t.Tuple[str, ...]:
+    """Callback to reject '--icon' if several pictures are given."""
+
+    if value and len(ctx.params.get("picture", ())) > 1:
+        raise click.UsageError("Option '--icon' requires a single picture.", ctx)
+
+    return value
+
+
+def _icon(
+    kwargs: t.Dict[str, t.Any],
+) -> t.Tuple[int, str, t.Optional[str], t.Dict[str, t.Dict[str, t.Any]]]:
+    """
+    Run `icon()` and capture its output, the error and the updates of its
+    `Manifest`, e.g. inside a worker process. Errors exit with 3 like `traceback()`,
+    so the other pictures are still converted.
+    """
+
+    record = kwargs["manifest"]
+    error = None
+
+    with cl.redirect_stdout(io.StringIO()) as stdout:
+        try:
+            exitcode = icon(**kwargs)
+        except Exception as e:
+            exitcode, error = 3, repr(e)
+
+    return exitcode, stdout.getvalue(), error, record.updates if record else {}
+
+
+def icons(
+    picture: t.Iterable[str],
+    icon: t.Union[str, t.Sequence[str], None] = None,
+    size: t.Optional[tuple[int]] = None,
+    jobs: t.Optional[int] = None,
+    cache: t.Optional[str] = None,
+    cache_size: int = 64,
+    resample: str = "lanczos",
+    fast: bool = False,
+    memory_budget: t.Optional[int] = None,
+    manifest: t.Optional[str] = None,
+    check: bool = False,
+) -> int:
+    """convert images to icons with multiple sizes."""
+
+    files = pictures(picture)
+
+    if icon and len(files) > 1:
+        raise ValueError("Option '--icon' requires a single picture.")
+
+    # the manifest is loaded once, each task only gets the entries of its outputs
+    record = Manifest(manifest) if manifest else None
+    siz = tuple(size) if size else SIZES
+
+    tasks = [
+        {
+            "picture": str(file),
+            "icon": icon,
+            "size": size,
+            "cache": cache,
+            "cache_size": cache_size,
+            "resample": resample,
+            "fast": fast,
+            "memory_budget": memory_budget,
+            "manifest": (
+                record.subset(path for path, _ in targets(file, icon, siz))
+                if record
+                else None
+            ),
+            "check": check,
+        }
+        for file in files
+    ]
+    jobs = min(jobs or os.cpu_count() or 1, len(tasks))
+
+    with cl.ExitStack() as stack:
+        if jobs > 1:
+            pool = stack.enter_context(cf.ProcessPoolExecutor(jobs))
+            results = pool.map(_icon, tasks)
+        else:
+            results = map(_icon, tasks)
+
+        exitcode = 0
+
+        # workers only record, the manifest is written once by this process
+        for file, (result, output, error, updates) in zip(files, results):
+            print(output, end="")
+
+            if error:
+                click.echo(f"{file}: {error}", err=True)
+
+            if record:
+                record.update(updates)
+
+            if len(files) > 1:
+                click.echo(f"{file}: exitcode {result}", err=True)
+
+            exitcode = max(exitcode, result)
+
+        if record:
+            record.save()
+
+    if memory_budget:
+        rss = peak_rss()
+
+        if rss is not None:
+            click.echo(f"peak rss: {rss / 2**20:.1f} MiB", err=True)
+
+    return exitcode
+
+
+@click.command(help=icons.__doc__)
 @click.argument(
     "picture",
-    type=click.Path(exists=True, dir_okay=False),
+    nargs=-1,
+    required=True,
+    type=click.Path(),
+    callback=_pictures,
 )
 @click.option(
     "-i",
     "--icon",
     type=click.Path(dir_okay=False, writable=True),
-    default=None,
-    help="Output icon file name.",
+    multiple=True,
+    callback=_single,
+    help=(
+        "Output icon file name, only valid for a single picture. "
+        "Repeat for several .ico, .icns or .png targets."
+    ),
 )
 @click.option(
     "-s",
@@ -57,6 +372,128 @@ def icon(
     multiple=True,
     help="Multiple sizes for the icon.",
 )
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Number of worker processes, 0 uses all CPUs.",
+)
+@click.option(
+    "-r",
+    "--resample",
+    type=click.Choice(RESAMPLING, case_sensitive=False),
+    default="lanczos",
+    show_default=True,
+    help="Resampling filter to downscale the picture.",
+)
+@click.option(
+    "--fast",
+    is_flag=True,
+    help="Use reduced decoding and integer reduction for large pictures.",
+)
+@click.option(
+    "-m",
+    "--memory-budget",
+    type=click.IntRange(min=1),
+    default=None,
+    help=(
+        "Memory budget in MiB to decode a picture, reports the peak RSS. Only JPEG "
+        "and uncompressed BMP, PPM or TIFF pictures can be decoded at reduced "
+        "size, others like PNG fail if they exceed the budget."
+    ),
+)
+@click.option(
+    "--manifest",
+    type=click.Path(dir_okay=False, writable=True),
+    envvar="CLICKX_MANIFEST",
+    default=None,
+    help="Manifest file to record outputs, only stale outputs are re-encoded.",
+)
+@click.option(
+    "--check",
+    is_flag=True,
+    help="Only print stale outputs, exit code 1 if any output is stale.",
+)
+@click.option(
+    "--cache",
+    type=click.Path(file_okay=False, writable=True),
+    envvar="CLICKX_CACHE",
+    default=None,
+    help="Directory to cache encoded icons, skips unchanged conversions.",
+)
+@click.option(
+    "--cache-size",
+    type=click.IntRange(min=1),
+    envvar="CLICKX_CACHE_SIZE",
+    default=64,
+    show_default=True,
+    help="Size limit of the cache in MiB, least recently used icons are evicted.",
+)
 @traceback
+@timings
 def cli_icon(**kwargs):
-    return icon(**kwargs)
+    return icons(**kwargs)
+
+
+@click.command()
+@click.argument("distribution", nargs=-1, required=True)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, writable=True),
+    default=metadata.SNAPSHOT,
+    show_default=True,
+    help="Snapshot file to embed into an executable.",
+)
+@traceback
+def cli_snapshot(distribution: t.Tuple[str, ...], output: str) -> None:
+    """write package metadata to a snapshot file for executables."""
+
+    jsonfile.dump(output, metadata.dump(distribution))
+
+    click.echo(output)
+
+
+@click.command()
+@click.argument("distribution")
+@click.option(
+    "-p",
+    "--pattern",
+    multiple=True,
+    default=("*",),
+    show_default=True,
+    help="Glob pattern for resources in the package directory.",
+)
+@click.option(
+    "--relative",
+    is_flag=True,
+    help="Store paths relative to the index, e.g. for a bundled executable.",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, writable=True),
+    default=RESOURCES,
+    show_default=True,
+    help="Resource index to look up package resources without file system walks.",
+)
+@traceback
+def cli_resources(
+    distribution: str,
+    pattern: t.Tuple[str, ...],
+    relative: bool,
+    output: str,
+) -> None:
+    """write an index of package resources for PackageIcon lookups."""
+
+    file = Path(output)
+    entries = ResourceIndex.build(
+        metadata.package_dir(distribution),
+        pattern,
+        file.parent if relative else None,
+    )
+
+    ResourceIndex(file).update(distribution, entries)
+
+    click.echo(output)
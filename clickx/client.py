@@ -0,0 +1,111 @@
+import json
+import os
+import socket
+import sys
+import typing as t
+
+ENVVAR = "CLICKX_SOCKET"
+
+
+class Unreachable(ConnectionError):
+    """The daemon is not running or its socket is not trusted."""
+
+
+def address() -> str:
+    """
+    Returns the path of the daemon socket, set by the environment variable
+    `CLICKX_SOCKET` or in the runtime directory of the user.
+    """
+
+    if ENVVAR in os.environ:
+        return os.environ[ENVVAR]
+
+    directory = os.environ.get("XDG_RUNTIME_DIR")
+
+    if not directory:
+        import tempfile
+
+        directory = tempfile.gettempdir()
+
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME")
+
+    return os.path.join(directory, f"clickx-{user}.sock")
+
+
+def request(
+    argv: t.Sequence[str],
+    path: t.Optional[str] = None,
+    stdout: t.Optional[t.TextIO] = None,
+    stderr: t.Optional[t.TextIO] = None,
+) -> int:
+    """
+    Forwards the arguments of a `clickx` command to the daemon and writes its
+    output to `stdout` and `stderr`. Returns the exit code of the command.
+
+    Raises `Unreachable` if no daemon of the current user accepts the connection,
+    errors after the request was sent are raised as they are.
+    """
+
+    path = path or address()
+
+    streams = {
+        "stdout": stdout or sys.stdout,
+        "stderr": stderr or sys.stderr,
+    }
+    message = {
+        "argv": list(argv),
+        "cwd": os.getcwd(),
+        "env": {k: v for k, v in os.environ.items() if k.startswith("CLICKX_")},
+    }
+
+    try:
+        family = socket.AF_UNIX
+        owner = os.stat(path).st_uid
+    except (AttributeError, OSError) as e:
+        raise Unreachable(f"No daemon is listening on '{path}'.") from e
+
+    if hasattr(os, "getuid") and owner != os.getuid():
+        raise Unreachable(f"Socket '{path}' is owned by another user.")
+
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError as e:
+            raise Unreachable(f"No daemon is listening on '{path}'.") from e
+
+        sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+        with sock.makefile("r", encoding="utf-8") as response:
+            for line in response:
+                reply = json.loads(line)
+
+                if "exitcode" in reply:
+                    return reply["exitcode"]
+
+                stream = streams[reply["stream"]]
+                stream.write(reply["data"])
+                stream.flush()
+
+    raise RuntimeError("The daemon closed the connection without an exit code.")
+
+
+def main(argv: t.Optional[t.Sequence[str]] = None) -> None:
+    """
+    Thin client for `clickx daemon`, which runs the command in this process if the
+    daemon is not reachable.
+    """
+
+    args = sys.argv[1:] if argv is None else list(argv)
+
+    try:
+        exitcode = request(args)
+    except Unreachable:
+        from .__main__ import cli
+
+        cli(args, prog_name="clickx")
+    else:
+        sys.exit(exitcode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import concurrent.futures as cf
+import contextlib as cl
+import importlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import traceback as tb
+import typing as t
+
+import click
+
+from . import instrumentation
+from .client import address
+from .decorators import traceback
+
+
+def warmup() -> None:
+    """
+    Imports the command modules and `pillow` once in each worker process, which are
+    shut down by the daemon instead of signals to the process group.
+    """
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    for module in ("clickx.__main__", "clickx.cli", "PIL.Image"):
+        with cl.suppress(ModuleNotFoundError):
+            importlib.import_module(module)
+
+
+# working directory and environment of the previous request in this process
+_state: t.Optional[t.Tuple[str, t.Tuple[t.Tuple[str, str], ...]]] = None
+
+
+def refresh() -> None:
+    """
+    Clears the memoized lookups, e.g. of `CLICKX_RESOURCES` or relative paths, if
+    the working directory or the `CLICKX_*` environment differ from the previous
+    request.
+    """
+
+    global _state
+
+    state = (
+        os.getcwd(),
+        tuple(sorted((k, v) for k, v in os.environ.items() if k.startswith("CLICKX_"))),
+    )
+
+    if state != _state:
+        from . import metadata
+        from . import resources
+
+        metadata.cache_clear()
+        resources.index.cache_clear()
+
+    _state = state
+
+
+def run(
+    argv: t.Sequence[str],
+    cwd: t.Optional[str] = None,
+    env: t.Optional[t.Dict[str, str]] = None,
+) -> t.Tuple[int, str, str]:
+    """
+    Runs a `clickx` command in the working directory and with the environment
+    variables of the client. Returns the exit code and the captured output.
+    """
+
+    from .__main__ import cli
+
+    if list(argv)[:1] == ["daemon"]:
+        return 2, "", "Error: The daemon can not be started by a client.\n"
+
+    directory = os.getcwd()
+    environ = dict(os.environ)
+
+    with cl.redirect_stdout(io.StringIO()) as stdout, cl.redirect_stderr(
+        io.StringIO()
+    ) as stderr:
+        try:
+            os.chdir(cwd or directory)
+            os.environ.update(env or {})
+            refresh()
+
+            cli.main(list(argv), prog_name="clickx")
+            exitcode = 0
+        except SystemExit as e:
+            exitcode = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except Exception:
+            tb.print_exc()
+            exitcode = 1
+        finally:
+            os.chdir(directory)
+            os.environ.clear()
+            os.environ.update(environ)
+            instrumentation.enable(None)
+
+    return exitcode, stdout.getvalue(), stderr.getvalue()
+
+
+class Handler(socketserver.StreamRequestHandler):
+    """Runs one request per connection on the worker pool of the server."""
+
+    server: "Server"
+
+    def send(self, reply: t.Dict[str, t.Any]) -> None:
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+    def handle(self) -> None:
+        message = json.loads(self.rfile.readline())
+
+        future = self.server.pool.submit(
+            run,
+            message["argv"],
+            message.get("cwd"),
+            message.get("env"),
+        )
+        exitcode, stdout, stderr = future.result()
+
+        for stream, data in (("stdout", stdout), ("stderr", stderr)):
+            if data:
+                self.send({"stream": stream, "data": data})
+
+        self.send({"exitcode": exitcode})
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, pool: cf.Executor) -> None:
+        self.pool = pool
+        super().__init__(path, Handler)
+
+
+def interrupt(signum: int, frame: t.Any) -> None:
+    """Signal handler to shut down the daemon like on `KeyboardInterrupt`."""
+
+    raise KeyboardInterrupt
+
+
+def stale(path: str) -> bool:
+    """Returns `True` if a socket file exists, but no daemon is listening."""
+
+    if not os.path.exists(path):
+        return False
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            return True
+
+    return False
+
+
+def serve(path: t.Optional[str] = None, jobs: t.Optional[int] = None) -> None:
+    """
+    Serves `clickx` commands on a unix socket until interrupted, each command runs in
+    a warm worker process of the pool.
+    """
+
+    path = path or address()
+
+    if stale(path):
+        os.remove(path)
+    elif os.path.exists(path):
+        raise FileExistsError(f"A daemon is already listening on '{path}'.")
+
+    signal.signal(signal.SIGTERM, interrupt)
+
+    with cf.ProcessPoolExecutor(jobs or None, initializer=warmup) as pool:
+        # bind the socket accessible for the current user only
+        umask = os.umask(0o077)
+
+        try:
+            server = Server(path, pool)
+        finally:
+            os.umask(umask)
+
+        with server:
+            click.echo(f"clickx daemon listening on {path}", err=True)
+
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                os.remove(path)
+
+
+@click.command()
+@click.option(
+    "--socket",
+    "path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Path of the unix socket, defaults to CLICKX_SOCKET or the runtime dir.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Number of worker processes, 0 uses all CPUs.",
+)
+@traceback
+def cli_daemon(path: t.Optional[str], jobs: int) -> None:
+    """serve commands to the clickx-client over a unix socket."""
+
+    serve(path, jobs)
@@ -1,11 +1,27 @@
 from __future__ import annotations
 
+import concurrent.futures as cf
 import contextlib as cl
 import functools
+import inspect
+import io
+import json
+import multiprocessing as mp
+import os
+import sys
 import traceback as tb
 import typing as t
 
 import click
+from click.globals import pop_context
+from click.globals import push_context
+
+from . import instrumentation
+from .profiler import profiler
+from .writers import LocalStream
+from .writers import RotatingFile
+from .writers import Tee
+from .writers import WRITERS
 
 if t.TYPE_CHECKING:
     from click.decorators import FC
@@ -28,6 +44,36 @@ def param(param_decls: t.List[str]) -> str:
     return keyword.lstrip("-").replace("-", "_")
 
 
+def synchronous(func: t.Callable, limit: t.Optional[int] = None) -> t.Callable:
+    """
+    Returns a function running a coroutine function on a managed event loop, see
+    `clickx.aio.run()`, so the decorators accept `async def` commands.
+    """
+
+    if not inspect.iscoroutinefunction(func):
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        from . import aio
+
+        return aio.run(func(*args, **kwargs), limit)
+
+    return wrapper
+
+
+def sink(
+    console: t.Optional[t.IO],
+    files: t.Tuple[t.IO, ...],
+    tee: bool,
+) -> t.IO:
+    """Returns a stream writing to all files and optionally to the console."""
+
+    streams = (console, *files) if tee and console is not None else files
+
+    return streams[0] if len(streams) == 1 else t.cast(t.IO, Tee(*streams))
+
+
 def redirect(
     func: t.Optional[t.Callable] = None,
     /,
@@ -35,11 +81,24 @@ def redirect(
     stderr: bool = False,
     errors: bool = True,
     param_decls: t.Optional[t.List[str]] = None,
+    writer: t.Optional[str] = None,
+    tee: bool = False,
     **attrs,
 ) -> t.Union[FC, t.Callable[[FC], FC]]:
     """
     This decorator adds an option to a `click.command()` that allows the user to specify
     a file to which the command's output will be redirected and appended.
+
+    With `writer="buffered"` output is written in large chunks, with `writer="thread"`
+    a background thread writes it, both are flushed before the command returns.
+
+    Files are rotated with `rotate_size` in bytes and/or `rotate_interval` in
+    seconds, rotated segments are compressed with `compress="gzip"` or `"zstd"` and
+    limited to the newest `backups` segments, see `clickx.writers.RotatingFile`.
+
+    With `tee=True` the output is also written to the console. Pass `multiple=True`
+    to redirect into several files, and stack the decorator with different
+    `param_decls` to route stdout and stderr independently.
     """
 
     if not param_decls:
@@ -48,7 +107,7 @@ def redirect(
     keyword = param(param_decls)
     exceptions: ExceptionTuple = attrs.pop("exceptions", (Exception,))
 
-    kwargs = {
+    file_kwargs = {
         k: attrs.pop(k, v)
         for k, v in {
             "mode": "w",
@@ -59,51 +118,184 @@ def redirect(
         }.items()
     }
 
+    rotate_kwargs = {
+        k: attrs.pop(k)
+        for k in ("rotate_size", "rotate_interval", "compress", "backups")
+        if k in attrs
+    }
+
+    if rotate_kwargs:
+        file_type: click.ParamType = click.Path(dir_okay=False, writable=True)
+    else:
+        file_type = click.File(**file_kwargs)
+
+    if writer is not None and writer not in WRITERS:
+        raise ValueError(f"writer must be one of {list(WRITERS)}, not {writer!r}.")
+
+    writer_kwargs = {
+        k: attrs.pop(k) for k in ("buffer_size", "queue_size") if k in attrs
+    }
+
     attrs.setdefault("help", "Redirect console output to file.")
     attrs.setdefault("default", None)
 
     def decorator(func):
+        func = synchronous(func)
+
         @click.option(
             *param_decls,
-            type=click.File(**kwargs),
+            type=file_type,
             **attrs,
         )
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
 
-            redirect: t.IO = kwargs.pop(keyword, None)
+            redirect: t.Union[t.IO, t.Tuple[t.IO, ...], None] = kwargs.pop(
+                keyword, None
+            )
 
-            if redirect is None:
+            files = redirect if isinstance(redirect, tuple) else (redirect,)
+            files = tuple(file for file in files if file is not None)
+
+            if not files:
                 return func(*args, **kwargs)
 
             with cl.ExitStack() as stack:
+                if rotate_kwargs:
+                    files = tuple(
+                        stack.enter_context(
+                            RotatingFile(
+                                file,
+                                mode=file_kwargs["mode"],
+                                encoding=file_kwargs["encoding"],
+                                errors=file_kwargs["errors"],
+                                **rotate_kwargs,
+                            )
+                        )
+                        for file in files
+                    )
+
+                if writer is not None:
+                    files = tuple(
+                        stack.enter_context(WRITERS[writer](file, **writer_kwargs))
+                        for file in files
+                    )
+
+                sinks = {}
+
                 if stdout:
-                    stack.enter_context(cl.redirect_stdout(redirect))
+                    sinks["stdout"] = sink(sys.stdout, files, tee)
+                    stack.enter_context(cl.redirect_stdout(sinks["stdout"]))
                 if stderr:
-                    stack.enter_context(cl.redirect_stderr(redirect))
+                    sinks["stderr"] = sink(sys.stderr, files, tee)
+                    stack.enter_context(cl.redirect_stderr(sinks["stderr"]))
 
                 try:
                     return func(*args, **kwargs)
                 except exceptions as e:
                     if errors:
-                        tb.print_exception(e, file=redirect)
+                        tb.print_exception(e, file=sink(None, files, False))
                     raise
                 finally:
-                    redirect.flush()
+                    with instrumentation.phase("redirect.flush"):
+                        for stream in (*sinks.values(), *files):
+                            stream.flush()
 
         return wrapper
 
     return decorator(func) if callable(func) else decorator
 
 
+CAUSE = "\nThe above exception was the direct cause of the following exception:\n\n"
+CONTEXT = "\nDuring handling of the above exception, another exception occurred:\n\n"
+
+
+def print_traceback(
+    exception: BaseException,
+    limit: t.Optional[int] = None,
+    chain: t.Optional[int] = None,
+    file: t.Optional[t.TextIO] = None,
+) -> None:
+    """
+    Streams the traceback of an exception line by line to `file`, default `stderr`.
+
+    `limit` is passed to `traceback.TracebackException`, a negative value keeps the
+    innermost frames. `chain` limits the number of chained exceptions. Source lines
+    are read lazily through the `linecache`, only for the frames printed.
+    """
+
+    stream = file or sys.stderr
+
+    # the whole chain is captured once, each exception is formatted on its own
+    current: t.Optional[tb.TracebackException] = tb.TracebackException(
+        type(exception),
+        exception,
+        exception.__traceback__,
+        limit=limit,
+        lookup_lines=False,
+    )
+    exceptions: t.List[t.Tuple[tb.TracebackException, str]] = []
+
+    while current is not None:
+        if current.__cause__ is not None:
+            cause, message = current.__cause__, CAUSE
+        elif current.__context__ is not None and not current.__suppress_context__:
+            cause, message = current.__context__, CONTEXT
+        else:
+            cause, message = None, ""
+
+        exceptions.append((current, message))
+        current = cause
+
+    if chain is not None and len(exceptions) > chain + 1:
+        stream.write(f"[{len(exceptions) - chain - 1} chained exceptions truncated]\n")
+        exceptions = exceptions[: chain + 1]
+
+    for i, (te, message) in enumerate(reversed(exceptions)):
+        if i:
+            stream.write(message)
+
+        for line in te.format(chain=False):
+            stream.write(line)
+
+    stream.flush()
+
+
+def summarize(exception: BaseException, exitcode: t.Optional[int]) -> str:
+    """Returns a one-line json summary of an exception for log aggregation."""
+
+    frames = tb.extract_tb(exception.__traceback__, limit=-1)
+    frame = frames[-1] if frames else None
+
+    return json.dumps(
+        {
+            "exception": type(exception).__qualname__,
+            "message": str(exception),
+            "file": frame.filename if frame else None,
+            "line": frame.lineno if frame else None,
+            "function": frame.name if frame else None,
+            "exitcode": exitcode,
+        }
+    )
+
+
 def traceback(
     func: t.Optional[t.Callable] = None,
     /,
     exitcode: t.Optional[int] = 3,
     param_decls: t.Optional[t.List[str]] = None,
+    limit: t.Optional[int] = None,
+    chain: t.Optional[int] = None,
+    summary: bool = False,
     **attrs,
 ) -> t.Union[FC, t.Callable[[FC], FC]]:
-    """Decorator to catch all unhandled exception and print optionally the traceback."""
+    """
+    Decorator to catch all unhandled exception and print optionally the traceback.
+
+    The traceback is streamed to stderr and bounded by `limit` frames and `chain`
+    chained exceptions, see `print_traceback()`. With `summary=True` errors without
+    traceback are printed as a one-line json summary instead of the `repr()`.
+    """
 
     if not param_decls:
         param_decls = ["--traceback"]
@@ -114,6 +306,8 @@ def traceback(
     attrs.setdefault("help", "Show the full traceback in case of an error.")
 
     def decorator(func):
+        func = synchronous(func)
+
         @click.option(
             *param_decls,
             is_flag=True,
@@ -130,13 +324,310 @@ def traceback(
                 result = exitcode
 
                 if traceback:
-                    message = tb.format_exc()
+                    print_traceback(e, limit, chain)
+                elif summary:
+                    click.echo(summarize(e, exitcode), err=True)
                 else:
-                    message = repr(e)
-                click.echo(message, err=True)
+                    click.echo(repr(e), err=True)
             finally:
                 raise SystemExit(result)
 
         return wrapper
 
     return decorator(func) if callable(func) else decorator
+
+
+def profile(
+    func: t.Optional[t.Callable] = None,
+    /,
+    interval: float = 0.001,
+    param_decls: t.Optional[t.List[str]] = None,
+    **attrs,
+) -> t.Union[FC, t.Callable[[FC], FC]]:
+    """
+    Decorator to profile the command and write the stats to a file. Files with a
+    `.collapsed` or `.folded` suffix are sampled every `interval` seconds and written
+    as collapsed stacks for flamegraphs, all others are `cProfile` pstats files.
+    """
+
+    if not param_decls:
+        param_decls = ["--profile"]
+
+    keyword = param(param_decls)
+
+    attrs.setdefault("help", "Profile the command and write the stats to file.")
+    attrs.setdefault("default", None)
+
+    def decorator(func):
+        func = synchronous(func)
+
+        @click.option(
+            *param_decls,
+            type=click.Path(dir_okay=False, writable=True),
+            **attrs,
+        )
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+
+            file = kwargs.pop(keyword, None)
+
+            if file is None:
+                return func(*args, **kwargs)
+
+            stats = profiler(file, interval)
+            stats.enable()
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats.disable()
+                stats.dump_stats(file)
+
+        return wrapper
+
+    return decorator(func) if callable(func) else decorator
+
+
+def timings(
+    func: t.Optional[t.Callable] = None,
+    /,
+    param_decls: t.Optional[t.List[str]] = None,
+    **attrs,
+) -> t.Union[FC, t.Callable[[FC], FC]]:
+    """
+    Decorator to record the timing of the command body and write the timings of all
+    phases as json lines to stderr. Set the environment variable `CLICKX_TIMINGS` to
+    `stderr` or a file to also record eager options, e.g. `--icon` or `--version`.
+    """
+
+    if not param_decls:
+        param_decls = ["--timings"]
+
+    keyword = param(param_decls)
+
+    attrs.setdefault("help", "Write timings of each phase as json lines to stderr.")
+
+    def decorator(func):
+        func = synchronous(func)
+
+        @click.option(
+            *param_decls,
+            is_flag=True,
+            **attrs,
+        )
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+
+            enabled = kwargs.pop(keyword, False) and instrumentation.target() is None
+
+            if enabled:
+                instrumentation.enable()
+
+            try:
+                with instrumentation.phase("command", command=func.__name__):
+                    return func(*args, **kwargs)
+            finally:
+                # only this command is timed, later commands in the process are not
+                if enabled:
+                    instrumentation.enable(None)
+
+        return wrapper
+
+    return decorator(func) if callable(func) else decorator
+
+
+EXECUTORS = ("thread", "process")
+
+# commands of `parallel()` by id, inherited by forked worker processes
+_commands: t.Dict[int, t.Callable] = {}
+
+
+def _job(
+    func: t.Union[int, t.Callable],
+    kwargs: t.Dict[str, t.Any],
+    exitcode: t.Optional[int],
+    streams: t.Optional[t.Tuple[LocalStream, LocalStream]] = None,
+    ctx: t.Optional[click.Context] = None,
+) -> t.Tuple[t.Optional[int], str, str]:
+    """
+    Runs the command body for one value of `parallel()` and returns its exit code
+    and output, captured per thread with `streams` or per worker process.
+    """
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+
+    with cl.ExitStack() as stack:
+        if streams is None:
+            stack.enter_context(cl.redirect_stdout(stdout))
+            stack.enter_context(cl.redirect_stderr(stderr))
+        else:
+            stack.enter_context(streams[0].redirect(stdout))
+            stack.enter_context(streams[1].redirect(stderr))
+
+        if ctx is not None:
+            push_context(ctx)
+            stack.callback(pop_context)
+
+        try:
+            result = (_commands[func] if isinstance(func, int) else func)(**kwargs)
+            result = result or 0
+        except SystemExit as e:
+            result = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except Exception as e:
+            result = exitcode
+            click.echo(repr(e), err=True)
+
+    return result, stdout.getvalue(), stderr.getvalue()
+
+
+def parallel(
+    func: t.Optional[t.Callable] = None,
+    /,
+    argument: t.Optional[str] = None,
+    executor: str = "thread",
+    exitcode: t.Optional[int] = 3,
+    param_decls: t.Optional[t.List[str]] = None,
+    **attrs,
+) -> t.Union[FC, t.Callable[[FC], FC]]:
+    """
+    Decorator to run the command body once per value of a `nargs=-1` argument, which
+    defaults to the first one of the command, on a `"thread"` or forked `"process"`
+    pool of `--jobs` workers.
+
+    The output of each run is written in the order of the values. Errors of a run
+    are printed and mapped to `exitcode` like `traceback()`, the command returns the
+    highest exit code of all runs.
+    """
+
+    if not param_decls:
+        param_decls = ["--jobs"]
+
+    keyword = param(param_decls)
+
+    if executor not in EXECUTORS:
+        raise ValueError(f"executor must be one of {EXECUTORS}, not {executor!r}.")
+
+    if executor == "process" and "fork" not in mp.get_all_start_methods():
+        raise ValueError("executor 'process' requires the 'fork' start method.")
+
+    attrs.setdefault("help", "Number of parallel jobs, 0 uses all CPUs.")
+    attrs.setdefault("default", 0)
+
+    def decorator(func):
+        func = synchronous(func)
+
+        @click.option(
+            *param_decls,
+            type=click.IntRange(min=0),
+            **attrs,
+        )
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+
+            jobs = kwargs.pop(keyword, 0)
+            ctx = click.get_current_context()
+
+            name = argument or next(
+                p.name
+                for p in ctx.command.params
+                if isinstance(p, click.Argument) and p.nargs == -1
+            )
+            values = kwargs[name] or ()
+
+            if not values:
+                return 0
+
+            jobs = min(jobs or os.cpu_count() or 1, len(values))
+            tasks = [{**kwargs, name: value} for value in values]
+
+            with cl.ExitStack() as stack:
+                if executor == "process":
+                    _commands[id(func)] = func
+                    stack.callback(_commands.pop, id(func))
+
+                    pool: cf.Executor = cf.ProcessPoolExecutor(
+                        jobs, mp_context=mp.get_context("fork")
+                    )
+                    futures = [
+                        pool.submit(_job, id(func), task, exitcode) for task in tasks
+                    ]
+                else:
+                    streams = (
+                        stack.enter_context(
+                            cl.redirect_stdout(LocalStream(sys.stdout))
+                        ),
+                        stack.enter_context(
+                            cl.redirect_stderr(LocalStream(sys.stderr))
+                        ),
+                    )
+
+                    pool = cf.ThreadPoolExecutor(jobs)
+                    futures = [
+                        pool.submit(_job, func, task, exitcode, streams, ctx)
+                        for task in tasks
+                    ]
+
+                stack.callback(pool.shutdown, cancel_futures=True)
+
+                result = 0
+
+                for future in futures:
+                    code, stdout, stderr = future.result()
+
+                    sys.stdout.write(stdout)
+                    sys.stdout.flush()
+                    sys.stderr.write(stderr)
+                    sys.stderr.flush()
+
+                    result = max(result, code or 0)
+
+            return result
+
+        return wrapper
+
+    return decorator(func) if callable(func) else decorator
+
+
+def asynchronous(
+    func: t.Optional[t.Callable] = None,
+    /,
+    concurrency: t.Optional[int] = None,
+    param_decls: t.Optional[t.List[str]] = None,
+    **attrs,
+) -> t.Union[FC, t.Callable[[FC], FC]]:
+    """
+    Decorator to run an `async def` command on a managed event loop, which adds an
+    option to limit the concurrent awaitables of `clickx.gather()`. Pending tasks
+    are cancelled on `KeyboardInterrupt`.
+
+    The other decorators accept `async def` commands as well, stack them on top to
+    handle errors and exit codes with `traceback()` or redirect with `redirect()`.
+    """
+
+    if not param_decls:
+        param_decls = ["--concurrency"]
+
+    keyword = param(param_decls)
+
+    attrs.setdefault("help", "Maximum number of concurrent tasks.")
+    attrs.setdefault("default", concurrency)
+
+    def decorator(func):
+        if not inspect.iscoroutinefunction(func):
+            raise TypeError(f"'{func.__name__}' is not a coroutine function.")
+
+        @click.option(
+            *param_decls,
+            type=click.IntRange(min=1),
+            **attrs,
+        )
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+
+            limit = kwargs.pop(keyword, None)
+
+            return synchronous(func, limit)(*args, **kwargs)
+
+        return wrapper
+
+    return decorator(func) if callable(func) else decorator
@@ -0,0 +1,43 @@
+import importlib
+import typing as t
+
+import click
+
+
+class LazyGroup(click.Group):
+    """
+    A `click.Group` with subcommands registered by their dotted import path, e.g.
+    `"clickx.cli.cli_icon"`, which are imported only when invoked or when the help
+    is rendered.
+    """
+
+    def __init__(
+        self,
+        *args,
+        lazy_subcommands: t.Optional[t.Dict[str, str]] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = dict(lazy_subcommands or {})
+
+    def add_lazy_command(self, import_path: str, name: str) -> None:
+        """Registers a subcommand by its dotted import path."""
+
+        self.lazy_subcommands[name] = import_path
+
+    def list_commands(self, ctx: click.Context) -> t.List[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
+
+    def get_command(
+        self, ctx: click.Context, cmd_name: str
+    ) -> t.Optional[click.Command]:
+        if cmd_name not in self.lazy_subcommands:
+            return super().get_command(ctx, cmd_name)
+
+        module, _, name = self.lazy_subcommands[cmd_name].rpartition(".")
+        command = getattr(importlib.import_module(module), name)
+
+        if not isinstance(command, click.Command):
+            raise TypeError(f"'{module}.{name}' is not a click command.")
+
+        return command
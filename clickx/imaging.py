@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import io
+import typing as t
+from pathlib import Path
+
+if t.TYPE_CHECKING:
+    from PIL import Image
+
+RESAMPLING = ("nearest", "box", "bilinear", "hamming", "bicubic", "lanczos")
+
+
+def fit(size: t.Tuple[int, int], length: int) -> t.Tuple[int, int]:
+    """Returns `size` scaled down to fit into a square of `length`, keeps aspect."""
+
+    width, height = size
+    scale = length / max(width, height)
+
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def frames(
+    img: Image.Image,
+    sizes: t.Iterable[int],
+    resample: str = "lanczos",
+    fast: bool = False,
+) -> t.List[Image.Image]:
+    """
+    Returns one frame per size, largest first, as a mip-chain where each frame is
+    downscaled from the next larger one instead of from the full resolution source.
+    Sizes larger than the source are skipped.
+
+    With `fast=True` JPEG sources are decoded at reduced scale with `Image.draft()`
+    and large downscales use `Image.reduce()` before resampling.
+    """
+
+    from PIL import Image
+
+    method = Image.Resampling[resample.upper()]
+    lengths = sorted({s for s in sizes if s <= max(img.size)}, reverse=True)
+
+    if not lengths:
+        return []
+
+    if fast:
+        img.draft(img.mode, fit(img.size, lengths[0]))
+
+    result = []
+    level = img
+
+    for length in lengths:
+        size = fit(img.size, length)
+
+        if level.size != size:
+            level = level.resize(size, method, reducing_gap=3.0 if fast else None)
+
+        result.append(level)
+
+    return result
+
+
+def decoded_size(img: Image.Image) -> int:
+    """Returns the approximate size in bytes of the decoded image."""
+
+    return img.width * img.height * len(img.getbands())
+
+
+def _bands(
+    img: Image.Image,
+    picture: t.Union[str, Path],
+    factor: int,
+    budget: int,
+) -> t.Optional[Image.Image]:
+    """
+    Decodes an uncompressed image in horizontal bands, which are read from the file,
+    reduced by `factor` and pasted into the result, so the full resolution is never
+    in memory. Returns `None` if the image is not stored as a single raw tile.
+    """
+
+    from PIL import Image
+    from PIL import ImageFile
+
+    if not isinstance(img, ImageFile.ImageFile) or len(img.tile) != 1:
+        return None
+
+    codec, extents, offset, args = img.tile[0]
+
+    if codec != "raw" or extents is None or args is None:
+        return None
+
+    x0, y0, width, height = extents
+    if isinstance(args, str):
+        args = (args,)
+
+    rawmode, stride, orientation = (*args, 0, 1)[:3]
+    bands = len(img.getbands())
+
+    # only 8-bit per band layouts, e.g. RGB or BGR, have a row size of width * bands
+    if (x0, y0) != (0, 0) or img.mode in ("1", "I", "F", "P") or len(rawmode) != bands:
+        return None
+
+    stride = stride or width * bands
+    orientation = orientation or 1
+    rows = max(factor, budget // 4 // stride // factor * factor)
+
+    result = Image.new(img.mode, (-(-width // factor), -(-height // factor)))
+
+    with open(picture, "rb") as f:
+        for top in range(0, height, rows):
+            bottom = min(top + rows, height)
+
+            f.seek(offset + stride * (top if orientation > 0 else height - bottom))
+            data = f.read(stride * (bottom - top))
+
+            try:
+                band = Image.frombuffer(
+                    img.mode,
+                    (width, bottom - top),
+                    data,
+                    "raw",
+                    rawmode,
+                    stride,
+                    orientation,
+                )
+            except ValueError:
+                return None
+
+            result.paste(band.reduce(factor), (0, top // factor))
+
+    return result
+
+
+def load(
+    picture: t.Union[str, Path],
+    lengths: t.Iterable[int],
+    budget: t.Optional[int] = None,
+) -> Image.Image:
+    """
+    Opens a picture for icons up to the largest of `lengths`. With a `budget` in
+    bytes the picture is decoded at reduced scale with `Image.draft()` for JPEG or
+    band-wise for uncompressed formats, if the full resolution exceeds the budget.
+    Raises a `MemoryError` if the decoded picture still exceeds the budget.
+    """
+
+    from PIL import Image
+
+    img = Image.open(picture)
+
+    if budget is None or decoded_size(img) <= budget:
+        return img
+
+    longest = 2 * max(lengths)
+
+    img.draft(img.mode, fit(img.size, longest))
+
+    if decoded_size(img) <= budget:
+        return img
+
+    factor = max(img.size) // longest
+
+    if factor > 1:
+        reduced = _bands(img, picture, factor, budget)
+
+        if reduced is not None and decoded_size(reduced) <= budget:
+            img.close()
+            return reduced
+
+    raise MemoryError(
+        f"Decoding {img.width}x{img.height} {img.format} needs about "
+        f"{decoded_size(img) / 2**20:.0f} MiB, exceeding the budget of "
+        f"{budget / 2**20:.0f} MiB."
+    )
+
+
+FORMATS = {".ico": "ICO", ".icns": "ICNS", ".png": "PNG"}
+
+ICNS_SIZES = (16, 32, 64, 128, 256, 512, 1024)
+
+
+def outputs(
+    target: Path,
+    sizes: t.Iterable[int],
+) -> t.List[t.Tuple[Path, t.Optional[int]]]:
+    """
+    Returns the files written for a target as tuples of path and size. A `.png`
+    target is written once per size, either formatted with a `{size}` placeholder
+    in the path, e.g. `icons/{size}x{size}/app.png`, or as `app-{size}.png`.
+    """
+
+    suffix = target.suffix.lower()
+
+    if suffix not in FORMATS:
+        raise ValueError(
+            f"Unsupported icon format '{target.suffix}', use one of {list(FORMATS)}."
+        )
+
+    if suffix != ".png":
+        return [(target, None)]
+
+    if "{size}" in str(target):
+        return [(Path(str(target).format(size=s)), s) for s in sizes]
+
+    return [(target.with_name(f"{target.stem}-{s}{target.suffix}"), s) for s in sizes]
+
+
+def encode(
+    target: Path,
+    size: t.Optional[int],
+    frames: t.List[Image.Image],
+    sizes: t.Iterable[int],
+) -> t.Optional[bytes]:
+    """
+    Encodes the frames into the format of the target and returns the content, or
+    `None` if there is no frame for a `.png` size. Works on copies of the frames,
+    so encoders for several targets can run concurrently.
+    """
+
+    buffer = io.BytesIO()
+    fmt = FORMATS[target.suffix.lower()]
+
+    if fmt == "PNG":
+        frame = next((f for f in frames if max(f.size) == size), None)
+
+        if frame is None:
+            return None
+
+        frame.copy().save(buffer, format=fmt)
+    else:
+        if fmt == "ICO":
+            lengths = set(sizes)
+            frames = [f for f in frames if max(f.size) in lengths] or frames[:1]
+
+        copies = [f.copy() for f in frames]
+        copies[0].save(
+            buffer,
+            format=fmt,
+            sizes=[f.size for f in copies],
+            append_images=copies[1:],
+        )
+
+    return buffer.getvalue()
@@ -0,0 +1,92 @@
+import contextlib as cl
+import json
+import os
+import sys
+import time
+import typing as t
+
+ENVVAR = "CLICKX_TIMINGS"
+
+_target: t.Optional[str] = None
+
+
+def enable(target: t.Optional[str] = "stderr") -> None:
+    """
+    Enables the timings for this process, `target` is `"stderr"` or a file to which
+    the json lines are appended. `None` falls back to the environment variable.
+    """
+
+    global _target
+
+    _target = target
+
+
+def target() -> t.Optional[str]:
+    """Returns the target for the timings or `None` if they are disabled."""
+
+    return _target or os.environ.get(ENVVAR) or None
+
+
+def emit(record: t.Dict[str, t.Any]) -> None:
+    """Writes a record as json line to the target."""
+
+    line = json.dumps(record) + "\n"
+    file = target()
+
+    if file in ("1", "-", "stderr"):
+        stream = sys.__stderr__ or sys.stderr
+        stream.write(line)
+        stream.flush()
+    elif file:
+        with open(file, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+@cl.contextmanager
+def phase(name: str, **fields: t.Any) -> t.Iterator[None]:
+    """Records the monotonic start and end of a phase, if the timings are enabled."""
+
+    if target() is None:
+        yield
+        return
+
+    start = time.monotonic_ns()
+
+    try:
+        yield
+    finally:
+        end = time.monotonic_ns()
+
+        emit(
+            {
+                "phase": name,
+                "pid": os.getpid(),
+                "start_ns": start,
+                "end_ns": end,
+                "duration_ns": end - start,
+                **fields,
+            }
+        )
+
+
+def peak_rss() -> t.Optional[int]:
+    """
+    Returns the peak resident set size in bytes of this process or of its largest
+    worker process, `None` on platforms without the `resource` module.
+    """
+
+    try:
+        import resource
+    except ModuleNotFoundError:
+        return None
+
+    scale = 1 if sys.platform == "darwin" else 1024
+    peak = scale * resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = scale * resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+    # on linux ru_maxrss includes the peak of the parent process, VmHWM does not
+    with cl.suppress(OSError, StopIteration):
+        with open("/proc/self/status", encoding="ascii") as f:
+            peak = 1024 * int(next(i for i in f if i.startswith("VmHWM:")).split()[1])
+
+    return max(peak, children)
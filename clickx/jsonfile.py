@@ -0,0 +1,68 @@
+import contextlib as cl
+import json
+import os
+import sys
+import threading
+import typing as t
+from pathlib import Path
+
+
+def load(file: t.Union[str, Path]) -> t.Any:
+    """Returns the content of a json file, or an empty dict if it is not readable."""
+
+    try:
+        with open(file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def dump(file: t.Union[str, Path], data: t.Any, indent: t.Optional[int] = 2) -> None:
+    """
+    Writes a json file atomically through a temporary file in the same directory, so
+    readers never see a partially written file.
+    """
+
+    path = Path(file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    temp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}")
+
+    try:
+        temp.write_text(json.dumps(data, indent=indent), encoding="utf-8")
+        os.replace(temp, path)
+    finally:
+        temp.unlink(missing_ok=True)
+
+
+@cl.contextmanager
+def locked(file: t.Union[str, Path]) -> t.Iterator[None]:
+    """
+    Holds an exclusive lock on `<file>.lock` across processes, e.g. to load, merge
+    and dump a json file written by concurrent processes.
+    """
+
+    path = Path(file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with path.with_name(f"{path.name}.lock").open("a") as f:
+        if sys.platform == "win32":
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f, fcntl.LOCK_EX)
+
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
@@ -0,0 +1,172 @@
+import hashlib
+import os
+import typing as t
+from pathlib import Path
+
+from . import jsonfile
+
+Stat = t.Tuple[int, int]
+
+
+def stat(path: Path) -> t.Optional[Stat]:
+    """Returns modification time in nanoseconds and size of a file or `None`."""
+
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+
+    return st.st_mtime_ns, st.st_size
+
+
+def outdated(source: Path, output: Path) -> bool:
+    """Returns `True` if the output is missing or older than the source."""
+
+    src, out = stat(source), stat(output)
+
+    return out is None or (src is not None and out[0] < src[0])
+
+
+def digest(data: bytes) -> str:
+    """Returns the sha256 hex digest of the content."""
+
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(path: Path, chunk_size: int = 2**20) -> str:
+    """Returns the sha256 hex digest of a file, which is read in chunks."""
+
+    sha256 = hashlib.sha256()
+
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+
+    return sha256.hexdigest()
+
+
+class Manifest:
+    """
+    Dependency manifest which maps each output to its source picture and records
+    hash, modification time and size of both, together with a key of the options
+    used to encode the output.
+
+    `stale()` is a stat-only check, hashes are only compared by `unchanged()` for
+    outputs with a modified timestamp, e.g. after a checkout. Entries are merged
+    into the file on `save()` under a lock, e.g. for parallel pre-commit hooks.
+    Worker processes get a `subset()` and return their `updates` to the parent,
+    which saves them once.
+    """
+
+    def __init__(
+        self,
+        file: t.Union[str, Path],
+        entries: t.Optional[t.Dict[str, t.Dict[str, t.Any]]] = None,
+    ):
+        self._file = Path(file)
+        self._entries: t.Dict[str, t.Dict[str, t.Any]] = (
+            jsonfile.load(file) if entries is None else dict(entries)
+        )
+        self._updates: t.Dict[str, t.Dict[str, t.Any]] = {}
+
+    def _key(self, output: Path) -> str:
+        return os.path.normcase(os.path.abspath(output))
+
+    def subset(self, outputs: t.Iterable[Path]) -> "Manifest":
+        """
+        Returns a manifest with only the entries of the outputs, e.g. to pass it to a
+        worker process without loading the file again.
+        """
+
+        keys = (self._key(output) for output in outputs)
+
+        return Manifest(
+            self._file,
+            {key: self._entries[key] for key in keys if key in self._entries},
+        )
+
+    def stale(self, source: Path, output: Path, options: str) -> bool:
+        """Returns `True` unless the stats of source and output match the entry."""
+
+        entry = self._entries.get(self._key(output))
+
+        return (
+            entry is None
+            or entry["options"] != options
+            or entry["source"] != list(stat(source) or ())
+            or entry["output"] != list(stat(output) or ())
+        )
+
+    def unchanged(self, source: Path, output: Path, options: str) -> bool:
+        """
+        Returns `True` if the contents of source and output match the hashes of the
+        entry, even if their stats differ, and refreshes the recorded stats.
+        """
+
+        entry = self._entries.get(self._key(output))
+
+        if entry is None or entry["options"] != options:
+            return False
+
+        try:
+            hashes = file_digest(source), file_digest(output)
+        except OSError:
+            return False
+
+        if hashes != (entry["source_hash"], entry["output_hash"]):
+            return False
+
+        self.record(source, output, options, *hashes)
+
+        return True
+
+    def record(
+        self,
+        source: Path,
+        output: Path,
+        options: str,
+        source_hash: str,
+        output_hash: str,
+    ) -> None:
+        """Records the current stats and hashes of source and output."""
+
+        entry = {
+            "options": options,
+            "source": list(stat(source) or ()),
+            "output": list(stat(output) or ()),
+            "source_hash": source_hash,
+            "output_hash": output_hash,
+        }
+
+        self._entries[self._key(output)] = entry
+        self._updates[self._key(output)] = entry
+
+    @property
+    def updates(self) -> t.Dict[str, t.Dict[str, t.Any]]:
+        """Returns the entries recorded since the last `save()`."""
+
+        return dict(self._updates)
+
+    def update(self, updates: t.Dict[str, t.Dict[str, t.Any]]) -> None:
+        """Adds entries recorded by another manifest, e.g. in a worker process."""
+
+        self._entries.update(updates)
+        self._updates.update(updates)
+
+    def save(self) -> None:
+        """
+        Merges the recorded entries into the manifest file, under a lock file next to
+        it, so concurrent processes keep the entries of each other.
+        """
+
+        if not self._updates:
+            return
+
+        with jsonfile.locked(self._file):
+            entries = jsonfile.load(self._file)
+            entries.update(self._updates)
+
+            jsonfile.dump(self._file, entries)
+
+        self._entries = entries
+        self._updates = {}
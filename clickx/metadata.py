@@ -0,0 +1,138 @@
+import email.message
+import functools
+import importlib.metadata
+import os
+import sys
+import typing as t
+from pathlib import Path
+
+from . import jsonfile
+from .sitepackage import SitepackageIndex
+from .sitepackage import sitepackage_dir
+
+SNAPSHOT = "clickx-metadata.json"
+SNAPSHOT_ENVVAR = "CLICKX_METADATA"
+
+
+def frozen() -> bool:
+    """Returns `True` if running in an executable, e.g. built with `pyinstaller`."""
+
+    return bool(getattr(sys, "frozen", False))
+
+
+def bundle_dir() -> t.Optional[Path]:
+    """Returns the directory of data files bundled into a frozen executable."""
+
+    if not frozen():
+        return None
+
+    return Path(getattr(sys, "_MEIPASS", os.path.dirname(sys.executable)))
+
+
+def snapshot_file() -> t.Optional[Path]:
+    """
+    Returns the metadata snapshot set by the environment variable `CLICKX_METADATA`
+    or embedded next to a frozen executable, e.g. with `--add-data`.
+    """
+
+    if SNAPSHOT_ENVVAR in os.environ:
+        return Path(os.environ[SNAPSHOT_ENVVAR])
+
+    directory = bundle_dir()
+
+    return directory.joinpath(SNAPSHOT) if directory else None
+
+
+@functools.lru_cache(maxsize=None)
+def snapshot() -> t.Dict[str, t.Dict[str, t.List[str]]]:
+    """Returns the memoized metadata snapshot, or an empty one if there is none."""
+
+    file = snapshot_file()
+
+    return jsonfile.load(file) if file else {}
+
+
+@functools.lru_cache(maxsize=None)
+def metadata(distribution_name: str) -> importlib.metadata.PackageMetadata:
+    """
+    Returns the memoized package metadata for a distribution name, from the snapshot
+    if it contains the distribution.
+    """
+
+    headers = snapshot().get(SitepackageIndex.normalize(distribution_name))
+
+    if headers is not None:
+        message = email.message.Message()
+
+        for key, values in headers.items():
+            for value in values:
+                message[key] = value
+
+        return t.cast(importlib.metadata.PackageMetadata, message)
+
+    try:
+        return importlib.metadata.metadata(distribution_name)
+    except importlib.metadata.PackageNotFoundError as e:
+        if frozen():
+            raise RuntimeError(
+                "\n".join(
+                    [
+                        "Package metadata not found in executable.",
+                        f'Add "--copy-metadata={distribution_name}" '
+                        "to the pyinstaller command, or embed a snapshot from "
+                        f'"clickx snapshot {distribution_name}".',
+                    ]
+                )
+            ) from e
+
+        raise e
+
+
+def version(distribution_name: str) -> str:
+    """Returns the version from the package metadata."""
+
+    return metadata(distribution_name)["Version"]
+
+
+def homepage(distribution_name: str) -> str:
+    """Returns the homepage URL from the package metadata."""
+
+    meta = metadata(distribution_name)
+
+    urls = meta.get_all("Home-page") or meta.get_all("Project-URL") or [""]
+
+    return urls[0]
+
+
+def package_dir(distribution_name: str) -> Path:
+    """
+    Returns the directory of the installed package, or the executable if frozen.
+    """
+
+    if frozen():
+        return Path(sys.executable)
+
+    return sitepackage_dir(distribution_name)
+
+
+def cache_clear() -> None:
+    """Clears all memoized metadata, e.g. after installing a distribution."""
+
+    snapshot.cache_clear()
+    metadata.cache_clear()
+    sitepackage_dir.cache_clear()
+
+
+def dump(distribution_names: t.Iterable[str]) -> t.Dict[str, t.Dict[str, t.List[str]]]:
+    """Returns a snapshot of the package metadata of the distributions."""
+
+    entries = {}
+
+    for name in distribution_names:
+        meta = importlib.metadata.metadata(name)
+
+        entries[SitepackageIndex.normalize(name)] = {
+            key: meta.get_all(key) or [] for key in dict.fromkeys(meta)
+        }
+
+    return entries
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import importlib.metadata
-import sys
 import typing as t
 
 import click
 
+from . import metadata
+from .instrumentation import phase
 from .types import PackageIcon
 
 if t.TYPE_CHECKING:
@@ -20,40 +20,37 @@ def version(
     """
     A variant of `click.version_option` that also prints the homepage URL from
     the package metadata.
-    """
-
-    def decorator(func):
 
-        if distirbution_name is not None and "message" not in kwargs:
+    The metadata is only looked up when the option is triggered.
+    """
 
-            def homepage():
+    if distirbution_name is None or "message" in kwargs:
+        return click.version_option(package_name=distirbution_name, **kwargs)
 
-                try:
-                    metadata = importlib.metadata.metadata(distirbution_name)
-                except importlib.metadata.PackageNotFoundError as e:
-                    if getattr(sys, "frozen", False):
-                        raise RuntimeError(
-                            "\n".join(
-                                [
-                                    "Package metadata not found in executable.",
-                                    f'Add "--copy-metadata={distirbution_name}"'
-                                    "to the pyinstaller command.",
-                                ]
-                            )
-                        ) from e
+    param_decls = kwargs.pop("param_decls", None) or ["--version"]
+    version = kwargs.pop("version", None)
+    prog_name = kwargs.pop("prog_name", None)
 
-                    raise e
+    def callback(ctx: click.Context, param: click.Parameter, value: bool) -> None:
+        if not value or ctx.resilient_parsing:
+            return
 
-                return metadata.get("Home-page") or metadata.get("Project-URL") or ""
+        with phase("version", distribution=distirbution_name):
+            message = "%(prog)s, version %(version)s\n%(url)s" % {
+                "prog": prog_name or ctx.find_root().info_name,
+                "version": version or metadata.version(distirbution_name),
+                "url": url or metadata.homepage(distirbution_name),
+            }
 
-            kwargs["message"] = f"%(prog)s, version %(version)s\n{url or homepage()}"
+        click.echo(message, color=ctx.color)
+        ctx.exit()
 
-        return click.version_option(
-            package_name=distirbution_name,
-            **kwargs,
-        )(func)
+    kwargs.setdefault("is_flag", True)
+    kwargs.setdefault("expose_value", False)
+    kwargs.setdefault("is_eager", True)
+    kwargs.setdefault("help", "Show the version and exit.")
 
-    return decorator
+    return click.option(*param_decls, callback=callback, **kwargs)
 
 
 def icon(
@@ -0,0 +1,72 @@
+import collections
+import sys
+import threading
+import typing as t
+from pathlib import Path
+
+COLLAPSED = (".collapsed", ".folded")
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler sampling the stack of the profiled thread in a background
+    thread. The stats are written as collapsed stacks, one `frame;frame count` line
+    per unique stack, which is the input format of flamegraph tools.
+
+    Provides the `enable()`, `disable()` and `dump_stats()` interface of
+    `cProfile.Profile`.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self._interval = interval
+        self._stacks: t.Counter[str] = collections.Counter()
+        self._stop = threading.Event()
+        self._thread: t.Optional[threading.Thread] = None
+
+    def enable(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._sample,
+            args=(threading.get_ident(),),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def disable(self) -> None:
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _sample(self, ident: int) -> None:
+        while not self._stop.wait(self._interval):
+            frame = sys._current_frames().get(ident)
+            stack = []
+
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name})")
+                frame = frame.f_back
+
+            if stack:
+                self._stacks[";".join(reversed(stack))] += 1
+
+    def dump_stats(self, file: t.Union[str, Path]) -> None:
+        with open(file, "w", encoding="utf-8") as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def profiler(file: t.Union[str, Path], interval: float = 0.001) -> t.Any:
+    """
+    Returns a `SamplingProfiler` for files with a suffix in `COLLAPSED`, otherwise a
+    `cProfile.Profile`.
+    """
+
+    if Path(file).suffix.lower() in COLLAPSED:
+        return SamplingProfiler(interval)
+
+    import cProfile
+
+    return cProfile.Profile()
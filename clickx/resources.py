@@ -0,0 +1,123 @@
+import contextlib as cl
+import functools
+import mmap
+import os
+import typing as t
+from pathlib import Path
+
+from . import jsonfile
+from .metadata import bundle_dir
+from .sitepackage import SitepackageIndex
+
+RESOURCES = "clickx-resources.json"
+RESOURCES_ENVVAR = "CLICKX_RESOURCES"
+
+
+class ResourceIndex:
+    """
+    Build-time index of package resources in a json file, which maps the resource
+    names of each distribution to absolute paths or to paths relative to the index,
+    e.g. inside the bundle of a frozen executable.
+
+    Lookups only join paths, the file system is not accessed after loading.
+    """
+
+    def __init__(self, file: t.Union[str, Path]):
+        self._file = Path(file)
+        self._root = self._file.parent
+
+        self._entries: t.Dict[str, t.Dict[str, str]] = jsonfile.load(self._file)
+
+    @staticmethod
+    def build(
+        directory: Path,
+        patterns: t.Iterable[str] = ("*",),
+        relative_to: t.Optional[Path] = None,
+    ) -> t.Dict[str, str]:
+        """
+        Returns the index entries for all files matching `patterns` in the package
+        directory, relative to `relative_to` or absolute.
+        """
+
+        entries = {}
+
+        for pattern in patterns:
+            for file in sorted(directory.rglob(pattern)):
+                if not file.is_file() or "__pycache__" in file.parts:
+                    continue
+
+                name = file.relative_to(directory).as_posix()
+                path = file.resolve()
+
+                if relative_to is not None:
+                    path = Path(os.path.relpath(path, relative_to.resolve()))
+
+                entries[name] = path.as_posix()
+
+        return entries
+
+    def update(self, distribution_name: str, entries: t.Dict[str, str]) -> None:
+        """Replaces the entries of a distribution and writes the index file."""
+
+        self._entries[SitepackageIndex.normalize(distribution_name)] = entries
+
+        jsonfile.dump(self._file, self._entries)
+
+    def lookup(self, distribution_name: str, name: str) -> t.Optional[Path]:
+        """Returns the path of an indexed resource or `None`."""
+
+        entries = self._entries.get(SitepackageIndex.normalize(distribution_name), {})
+        path = entries.get(Path(name).as_posix())
+
+        return None if path is None else self._root.joinpath(path)
+
+    @cl.contextmanager
+    def open(self, distribution_name: str, name: str) -> t.Iterator[t.Any]:
+        """
+        Memory-maps the bytes of an indexed resource read-only. Raises a
+        `KeyError` if the resource is not indexed.
+        """
+
+        path = self.lookup(distribution_name, name)
+
+        if path is None:
+            raise KeyError(f"Resource '{name}' of '{distribution_name}' not indexed.")
+
+        with path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield b""
+                return
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield data
+
+
+def index_file() -> t.Optional[Path]:
+    """
+    Returns the resource index set by the environment variable `CLICKX_RESOURCES`
+    or bundled into a frozen executable.
+    """
+
+    if RESOURCES_ENVVAR in os.environ:
+        return Path(os.environ[RESOURCES_ENVVAR])
+
+    directory = bundle_dir()
+
+    return directory.joinpath(RESOURCES) if directory else None
+
+
+@functools.lru_cache(maxsize=None)
+def index() -> t.Optional[ResourceIndex]:
+    """Returns the memoized resource index or `None` if there is none."""
+
+    file = index_file()
+
+    return ResourceIndex(file) if file else None
+
+
+def lookup(distribution_name: str, name: str) -> t.Optional[Path]:
+    """Returns the path of a resource from the resource index or `None`."""
+
+    resources = index()
+
+    return resources.lookup(distribution_name, name) if resources else None
@@ -1,15 +1,131 @@
+import csv
+import functools
 import importlib.metadata
 import importlib.resources
+import io
+import json
+import os
+import re
 import typing as t
 from pathlib import Path
+from pathlib import PurePosixPath
+from urllib.parse import urlparse
 
+from . import jsonfile
 
+INDEX_ENVVAR = "CLICKX_SITEPACKAGE_INDEX"
+
+
+class SitepackageIndex:
+    """
+    Persistent index of resolved package directories in a json file.
+
+    Entries are keyed by the normalized distribution name and invalidated when the
+    version or the modification time of the `.dist-info` directory changes.
+    """
+
+    def __init__(self, file: t.Union[str, Path]):
+        self._file = Path(file)
+
+    @staticmethod
+    def normalize(distribution_name: str) -> str:
+        return re.sub(r"[-_.]+", "-", distribution_name).lower()
+
+    def resolve(self, distribution_name: str) -> Path:
+        """Returns the indexed package directory or resolves and indexes it."""
+
+        try:
+            dist = importlib.metadata.distribution(distribution_name)
+            info = _dist_info(dist)
+            stamp = {"version": dist.version, "mtime": info.stat().st_mtime_ns}
+        except (OSError, importlib.metadata.PackageNotFoundError):
+            return _sitepackage_dir(distribution_name)
+
+        key = self.normalize(distribution_name)
+        entries: t.Dict[str, t.Dict[str, t.Any]] = jsonfile.load(self._file)
+        entry = entries.get(key, {})
+
+        if all(entry.get(k) == v for k, v in stamp.items()):
+            return Path(entry["path"])
+
+        path = _sitepackage_dir(distribution_name)
+
+        entries[key] = {**stamp, "path": str(path)}
+        jsonfile.dump(self._file, entries)
+
+        return path
+
+
+def _dist_info(dist: importlib.metadata.Distribution) -> Path:
+    """
+    Returns the `.dist-info` directory of a distribution, which is named after the
+    escaped distribution name and the version.
+    """
+
+    name = re.sub(r"[-_.]+", "_", dist.metadata["Name"])
+
+    for stem in dict.fromkeys([name, name.lower()]):
+        info = Path(str(dist.locate_file(f"{stem}-{dist.version}.dist-info")))
+
+        if info.is_dir():
+            return info
+
+    raise FileNotFoundError(f"No .dist-info directory found for '{name}'.")
+
+
+@functools.lru_cache(maxsize=None)
 def sitepackage_dir(distribution_name: str) -> Path:
     """
     Returns the directory of a installed package, e.g. with
     `pip install <distribution_name>`.
+
+    Results are memoized per process, set the environment variable
+    `CLICKX_SITEPACKAGE_INDEX` to a json file to persist them across processes.
+    """
+
+    index = os.environ.get(INDEX_ENVVAR)
+
+    if index:
+        return SitepackageIndex(index).resolve(distribution_name)
+
+    return _sitepackage_dir(distribution_name)
+
+
+def _packages(dist: importlib.metadata.Distribution) -> t.Iterator[Path]:
+    """
+    Yields candidate package directories of a distribution lazily, cheapest source
+    first: `top_level.txt`, the `RECORD` entries and the `direct_url.json` of
+    editable installs.
     """
 
+    for name in (dist.read_text("top_level.txt") or "").split():
+        yield Path(str(dist.locate_file(name)))
+
+    record = dist.read_text("RECORD")
+
+    if record is None:
+        files = (file.parts for file in dist.files or [])
+    else:
+        rows = csv.reader(io.StringIO(record))
+        files = (PurePosixPath(row[0]).parts for row in rows if row)
+
+    for parts in files:
+        if len(parts) == 2 and parts[1] == "__init__.py":
+            yield Path(str(dist.locate_file(parts[0])))
+
+    url = json.loads(dist.read_text("direct_url.json") or "{}").get("url", "")
+
+    if url.startswith("file:"):
+        from urllib.request import url2pathname
+
+        editable_path = Path(url2pathname(urlparse(url).path))
+
+        for file in editable_path.glob("*/__init__.py"):
+            yield file.parent
+
+
+def _sitepackage_dir(distribution_name: str) -> Path:
+
     modulerror: t.Optional[Exception] = None
 
     try:
@@ -20,31 +136,15 @@ def sitepackage_dir(distribution_name: str) -> Path:
     except ModuleNotFoundError as e:
         modulerror = e
 
-    try:
-        files = [
-            file.locate()
-            for file in importlib.metadata.files(distribution_name) or []
-            if file.name == "__init__.py"
-            and len(file.parts) == 2
-            and file.parts[0].lower() != "tests"
-        ]
-
-        return Path(files[0]).parent
-    except (IndexError, ModuleNotFoundError):
-        pass
-
     try:
         dist = importlib.metadata.distribution(distribution_name)
 
-        editable_path = Path(dist.origin.url.removeprefix("file:///")).resolve(True)  # type: ignore[attr-defined] # noqa: E501
-
-        files = [
-            file
-            for file in editable_path.glob("*/__init__.py")
-            if file.relative_to(editable_path).parts[0].lower() != "tests"
-        ]
-
-        return Path(files[0]).parent
+        return next(
+            package
+            for package in _packages(dist)
+            if package.name.lower() != "tests"
+            and package.joinpath("__init__.py").is_file()
+        ).resolve()
     except Exception as e:
         raise modulerror from e
 
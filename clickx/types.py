@@ -1,10 +1,18 @@
-import sys
+import contextlib as cl
+import functools
+import importlib
+import mmap
+import os
+import stat
 import typing as t
 from pathlib import Path
 
 import click
 
-from .sitepackage import sitepackage_dir
+from .instrumentation import phase
+from .metadata import frozen
+from .metadata import package_dir
+from .resources import lookup
 
 
 class PackageIcon(click.ParamType):
@@ -21,6 +29,10 @@ class PackageIcon(click.ParamType):
         self._exitcode = exitcode
 
     def convert(self, value, param, ctx):
+        with phase("convert", param=self.name):
+            return self._convert(value, param, ctx)
+
+    def _convert(self, value, param, ctx):
         # value here is the flag‐value (True or False)
         if value is False:
             # If the flag is not set, we return None
@@ -28,17 +40,22 @@ class PackageIcon(click.ParamType):
 
         # exactly the same logic you had in your callback:
         try:
-            if getattr(sys, "frozen", False):
-                file = sys.executable
+            filename = value if isinstance(value, str) else self._filename
+            resource = (
+                lookup(self._package, filename) if self._package and filename else None
+            )
+
+            if resource is not None:
+                icon = resource
+            elif frozen():
+                icon = Path(package_dir(self._package)).resolve(True)
             else:
                 if self._package is None:
                     raise ctx.fail("'package_name' name is missing.")
 
-                filename = value if isinstance(value, str) else self._filename
+                file = package_dir(self._package).joinpath(filename)
 
-                file = sitepackage_dir(self._package).joinpath(filename)
-
-            icon = Path(file).resolve(True)
+                icon = Path(file).resolve(True)
 
         except Exception as e:
             ctx.fail(str(e))
@@ -48,3 +65,171 @@ class PackageIcon(click.ParamType):
                 ctx.exit(self._exitcode)
 
             return icon
+
+
+class MappedFile(click.ParamType):
+    """
+    Opens a file read-only as `mmap` and converts it to a zero-copy `memoryview`,
+    which is released when the click context is closed.
+
+    Pipes, `-` for stdin and other non-regular files are read into memory with
+    `fallback=True`, otherwise they are rejected.
+    """
+
+    name = "filename"
+
+    def __init__(self, fallback: bool = True):
+        self._fallback = fallback
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, memoryview):
+            return value
+
+        try:
+            with cl.ExitStack() as stack:
+                if value == "-":
+                    f, size = click.get_binary_stream("stdin"), None
+                else:
+                    f = stack.enter_context(open(value, "rb"))
+                    st = os.fstat(f.fileno())
+                    size = st.st_size if stat.S_ISREG(st.st_mode) else None
+
+                if size:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                elif size == 0 or self._fallback:
+                    data = f.read()
+                else:
+                    self.fail(f"{value!r} is not a regular file.", param, ctx)
+        except OSError as e:
+            self.fail(f"{value!r}: {e.strerror}", param, ctx)
+
+        view = memoryview(data)
+
+        if ctx is not None and isinstance(data, mmap.mmap):
+            ctx.call_on_close(functools.partial(self.close, view, data))
+
+        return view
+
+    @staticmethod
+    def close(view: memoryview, data: mmap.mmap) -> None:
+        """Releases the view and unmaps the file, unless slices are still in use."""
+
+        view.release()
+
+        with cl.suppress(BufferError):
+            data.close()
+
+
+# magic bytes of compressed streams, the class to decompress them and its argument
+MAGIC = (
+    (b"\x1f\x8b", "gzip.GzipFile", "fileobj"),
+    (b"BZh", "bz2.BZ2File", "filename"),
+    (b"\xfd7zXZ\x00", "lzma.LZMAFile", "filename"),
+)
+
+
+def decompress(stream: t.BinaryIO) -> t.BinaryIO:
+    """
+    Returns a decompressing stream for gzip, bz2 and xz data, detected by magic
+    bytes. Streams which can neither peek nor seek are returned unchanged.
+    """
+
+    if hasattr(stream, "peek"):
+        head = stream.peek(6)[:6]  # type: ignore[attr-defined]
+    elif stream.seekable():
+        position = stream.tell()
+        head = stream.read(6)
+        stream.seek(position)
+    else:
+        return stream
+
+    for magic, path, argument in MAGIC:
+        if head.startswith(magic):
+            module, _, name = path.rpartition(".")
+            cls = getattr(importlib.import_module(module), name)
+
+            return cls(mode="rb", **{argument: stream})
+
+    return stream
+
+
+class Chunks:
+    """
+    Lazy single-pass iterator over a binary stream, which yields lines as `bytes` or
+    chunks of up to `chunk_size` bytes as `memoryview` into a reused buffer. A chunk
+    is only valid until the next one is read, copy it with `bytes()` to keep it.
+    """
+
+    def __init__(
+        self,
+        stream: t.BinaryIO,
+        chunk_size: int = 2**16,
+        lines: bool = False,
+        close: t.Sequence[t.BinaryIO] = (),
+    ):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._lines = lines
+        self._close = close
+
+    def __iter__(self) -> t.Iterator[t.Union[bytes, memoryview]]:
+        if self._lines:
+            yield from self._stream
+            return
+
+        buffer = bytearray(self._chunk_size)
+        view = memoryview(buffer)
+
+        while True:
+            size = self._stream.readinto(view)  # type: ignore[attr-defined]
+
+            if not size:
+                break
+
+            yield view[:size]
+
+    def close(self) -> None:
+        """Closes the streams passed as `close`, e.g. not stdin."""
+
+        for stream in self._close:
+            stream.close()
+
+
+class StreamFile(click.ParamType):
+    """
+    Converts a file or `-` for stdin into `Chunks`, a lazy iterator over chunks or
+    lines, to process inputs larger than memory. gzip, bz2 and xz compressed inputs
+    are decompressed transparently. The file is closed with the click context.
+    """
+
+    name = "filename"
+
+    def __init__(self, chunk_size: int = 2**16, lines: bool = False):
+        self._chunk_size = chunk_size
+        self._lines = lines
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, Chunks):
+            return value
+
+        try:
+            if value == "-":
+                raw = click.get_binary_stream("stdin")
+            else:
+                raw = open(value, "rb")
+
+            stream = decompress(raw)
+        except OSError as e:
+            self.fail(f"{value!r}: {e.strerror}", param, ctx)
+
+        close = [stream] if stream is not raw else []
+
+        if value != "-":
+            close.append(raw)
+
+        chunks = Chunks(stream, self._chunk_size, self._lines, close)
+
+        if ctx is not None:
+            ctx.call_on_close(chunks.close)
+
+        return chunks
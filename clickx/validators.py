@@ -1,4 +1,197 @@
-try:
+"""
+Lazy proxy for the `click.ParamType` validators of `clicktypes`, which are imported
+on first attribute access, e.g. `clickx.validators.email()`.
+
+`batch()` validates all values of a `multiple=True` or `nargs=-1` parameter at once.
+"""
+
+import functools
+import importlib
+import importlib.util
+import re
+import typing as t
+
+if importlib.util.find_spec("clicktypes") is None:
+    raise ModuleNotFoundError("pip install click-tools[validators]")
+
+if t.TYPE_CHECKING:
+    import click
+
     from clicktypes import *  # noqa
-except ModuleNotFoundError as e:
-    raise ModuleNotFoundError("pip install click-tools[validators]") from e
+
+# validators of `clicktypes`, resolved by `__getattr__()` on a star import
+__all__ = [  # noqa: F405
+    "amex",
+    "base16",
+    "base32",
+    "base58",
+    "base64",
+    "bsc_address",
+    "btc_address",
+    "calling_code",
+    "card_number",
+    "country_code",
+    "cron",
+    "currency",
+    "cusip",
+    "diners",
+    "discover",
+    "domain",
+    "email",
+    "es_cif",
+    "es_doi",
+    "es_nie",
+    "es_nif",
+    "eth_address",
+    "fi_business_id",
+    "fi_ssn",
+    "fr_department",
+    "fr_ssn",
+    "hostname",
+    "iban",
+    "ind_aadhar",
+    "ind_pan",
+    "ipv4",
+    "ipv6",
+    "isin",
+    "jcb",
+    "mac_address",
+    "mastercard",
+    "md5",
+    "mir",
+    "ru_inn",
+    "sedol",
+    "sha1",
+    "sha224",
+    "sha256",
+    "sha384",
+    "sha512",
+    "slug",
+    "trx_address",
+    "unionpay",
+    "url",
+    "uuid",
+    "visa",
+    "Batch",
+    "PATTERNS",
+    "batch",
+]
+
+# validators which are a single regular expression, matched on all values at once
+PATTERNS: t.Dict[str, str] = {
+    "base16": r"[0-9A-Fa-f]+",
+    "base32": r"[A-Z2-7]+=*",
+    "base58": r"[1-9A-HJ-NP-Za-km-z]+",
+    "md5": r"[0-9a-fA-F]{32}",
+    "sha1": r"[0-9a-fA-F]{40}",
+    "sha224": r"[0-9a-fA-F]{56}",
+    "sha256": r"[0-9a-fA-F]{64}",
+    "sha384": r"[0-9a-fA-F]{96}",
+    "sha512": r"[0-9a-fA-F]{128}",
+    "slug": r"[a-z0-9]+(?:-[a-z0-9]+)*",
+}
+
+
+def __getattr__(name: str) -> t.Any:
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    attr = getattr(importlib.import_module("clicktypes"), name)
+    globals()[name] = attr
+
+    return attr
+
+
+def __dir__() -> t.List[str]:
+    return sorted({*globals(), *importlib.import_module("clicktypes").__all__})
+
+
+class Batch:
+    """
+    Callback for `click.option()` to validate all values of a parameter with a
+    validator of the `validators` package, e.g. `callback=batch("email")`.
+
+    Validators in `PATTERNS` compile their expression once and match all values in
+    one pass, all others are called once per distinct value. Invalid values are
+    reported in a single `click.BadParameter`.
+    """
+
+    def __init__(self, validator: str, **kwargs: t.Any):
+        self.name = validator
+        self._kwargs = kwargs
+
+    @functools.cached_property
+    def _pattern(self) -> t.Optional[t.Pattern[str]]:
+        if self.name not in PATTERNS or self._kwargs:
+            return None
+
+        pattern = PATTERNS[self.name]
+
+        # a single match over all values joined by newlines
+        return re.compile(rf"(?:(?:{pattern})\n)*(?:{pattern})")
+
+    @functools.cached_property
+    def _validator(self) -> t.Callable[[str], t.Any]:
+        import validators
+
+        func = getattr(validators, self.name)
+
+        # skip the wrapper creating a `ValidationError` for each invalid value
+        return functools.partial(getattr(func, "__wrapped__", func), **self._kwargs)
+
+    def valid(self, value: str) -> bool:
+        """Returns `True` if the value is valid."""
+
+        try:
+            return bool(self._validator(value))
+        except (ValueError, TypeError, UnicodeError):
+            return False
+
+    def invalid(self, values: t.Sequence[str]) -> t.List[str]:
+        """Returns all invalid values in order of occurrence."""
+
+        if self._pattern is not None and values:
+            text = "\n".join(values)
+
+            if text.count("\n") == len(values) - 1 and self._pattern.fullmatch(text):
+                return []
+
+        results: t.Dict[str, bool] = {}
+
+        for value in values:
+            if value not in results:
+                results[value] = self.valid(value)
+
+        return [value for value in values if not results[value]]
+
+    def __call__(
+        self,
+        ctx: "click.Context",
+        param: "click.Parameter",
+        value: t.Any,
+    ) -> t.Any:
+        import click
+
+        if value is None:
+            return value
+
+        values = value if isinstance(value, tuple) else (value,)
+        invalid = self.invalid(values)
+
+        if invalid:
+            shown = ", ".join(map(repr, invalid[:5]))
+            more = f" and {len(invalid) - 5} more" if len(invalid) > 5 else ""
+
+            raise click.BadParameter(
+                f"{len(invalid)} invalid {self.name} values: {shown}{more}",
+                ctx,
+                param,
+            )
+
+        return value
+
+
+def batch(validator: str, **kwargs: t.Any) -> Batch:
+    """Returns a callback to validate all values of a parameter in one pass."""
+
+    return Batch(validator, **kwargs)
@@ -0,0 +1,415 @@
+import codecs
+import concurrent.futures as cf
+import contextlib as cl
+import gzip
+import io
+import os
+import queue
+import shutil
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+
+class BufferedWriter(io.TextIOBase):
+    """
+    Text stream collecting writes in memory and passing them to the underlying
+    stream in chunks of at least `buffer_size` characters.
+    """
+
+    def __init__(self, stream: t.IO[str], buffer_size: int = 2**20):
+        self._stream = stream
+        self._buffer_size = buffer_size
+        self._buffer: t.List[str] = []
+        self._size = 0
+
+    @property
+    def encoding(self) -> str:  # type: ignore[override]
+        return getattr(self._stream, "encoding", "utf-8")
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        self._buffer.append(s)
+        self._size += len(s)
+
+        if self._size >= self._buffer_size:
+            self._drain()
+
+        return len(s)
+
+    def _drain(self) -> None:
+        if self._buffer:
+            self._write("".join(self._buffer))
+            self._buffer.clear()
+            self._size = 0
+
+    def _write(self, text: str) -> None:
+        self._stream.write(text)
+
+    def flush(self) -> None:
+        self._drain()
+        self._stream.flush()
+
+    def close(self) -> None:
+        if not self.closed:
+            self.flush()
+            super().close()
+
+
+class ThreadedWriter(BufferedWriter):
+    """
+    Text stream collecting writes in chunks of `buffer_size` characters, which are
+    handed over a bounded queue to a background thread writing them to the
+    underlying stream. Writes block only if `queue_size` chunks are pending.
+    """
+
+    def __init__(
+        self,
+        stream: t.IO[str],
+        buffer_size: int = 2**16,
+        queue_size: int = 2**6,
+    ):
+        super().__init__(stream, buffer_size)
+        self._queue: "queue.Queue[t.Optional[str]]" = queue.Queue(queue_size)
+        self._error: t.Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            text = self._queue.get()
+
+            try:
+                if text and self._error is None:
+                    self._stream.write(text)
+            except BaseException as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+            if text is None:
+                return
+
+    def _raise(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _write(self, text: str) -> None:
+        self._raise()
+        self._queue.put(text)
+
+    def flush(self) -> None:
+        self._drain()
+        self._queue.join()
+        self._raise()
+        self._stream.flush()
+
+    def close(self) -> None:
+        if not self.closed:
+            try:
+                self.flush()
+            finally:
+                self._queue.put(None)
+                self._thread.join()
+                super().close()
+
+
+class Tee(io.TextIOBase):
+    """
+    Text stream passing each write to all underlying streams. The text is encoded
+    only once per encoding and written directly to the binary buffers of the
+    streams, unless the platform translates newlines.
+    """
+
+    def __init__(self, *streams: t.IO[str]):
+        self._streams = streams
+        self._targets: t.List[t.Tuple[t.Callable, t.Optional[t.Tuple[str, str]]]] = []
+
+        for stream in streams:
+            buffer = getattr(stream, "buffer", None)
+            encoding = getattr(stream, "encoding", None)
+
+            if buffer is None or not encoding or os.linesep != "\n":
+                self._targets.append((stream.write, None))
+                continue
+
+            stream.flush()
+
+            if getattr(stream, "line_buffering", False):
+
+                def write(b: bytes, buffer=buffer) -> None:
+                    buffer.write(b)
+
+                    if b"\n" in b:
+                        buffer.flush()
+
+            else:
+                write = buffer.write
+
+            codec = (
+                codecs.lookup(encoding).name,
+                getattr(stream, "errors", None) or "strict",
+            )
+            self._targets.append((write, codec))
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        encoded: t.Dict[t.Tuple[str, str], bytes] = {}
+
+        for write, codec in self._targets:
+            if codec is None:
+                write(s)
+                continue
+
+            try:
+                data = encoded[codec]
+            except KeyError:
+                data = encoded[codec] = s.encode(*codec)
+
+            write(data)
+
+        return len(s)
+
+    def flush(self) -> None:
+        for stream in self._streams:
+            stream.flush()
+
+
+class LocalStream(io.TextIOBase):
+    """
+    Text stream writing to the stream redirected for the current thread, or to the
+    default stream, e.g. to capture the output of commands running in threads.
+    """
+
+    def __init__(self, default: t.IO[str]):
+        self._default = default
+        self._local = threading.local()
+
+    @property
+    def encoding(self) -> str:  # type: ignore[override]
+        return getattr(self._default, "encoding", "utf-8")
+
+    @property
+    def stream(self) -> t.IO[str]:
+        return getattr(self._local, "stream", None) or self._default
+
+    @cl.contextmanager
+    def redirect(self, stream: t.IO[str]) -> t.Iterator[t.IO[str]]:
+        """Redirects the writes of the current thread to `stream`."""
+
+        previous = getattr(self._local, "stream", None)
+        self._local.stream = stream
+
+        try:
+            yield stream
+        finally:
+            self._local.stream = previous
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        return self.stream.write(s)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def _gzip() -> t.Callable[[Path], t.BinaryIO]:
+    return lambda path: t.cast(t.BinaryIO, gzip.open(path, "wb"))
+
+
+def _zstd() -> t.Callable[[Path], t.BinaryIO]:
+    try:
+        from compression import zstd  # type: ignore[import-not-found]
+
+        return lambda path: zstd.open(path, "wb")
+    except ModuleNotFoundError:
+        pass
+
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ModuleNotFoundError as e:
+        raise ModuleNotFoundError("pip install zstandard") from e
+
+    return lambda path: zstandard.open(path, "wb")
+
+
+COMPRESSORS: t.Dict[
+    str, t.Tuple[str, t.Callable[[], t.Callable[[Path], t.BinaryIO]]]
+] = {
+    "gzip": (".gz", _gzip),
+    "zstd": (".zst", _zstd),
+}
+
+
+class RotatingFile(io.TextIOBase):
+    """
+    Text stream writing to `path` and rotating it to `path.1`, `path.2`, ... after
+    `rotate_size` bytes or `rotate_interval` seconds. Rotated segments are
+    optionally compressed with `compress="gzip"` or `"zstd"` in a background thread
+    and only the newest `backups` segments are kept.
+    """
+
+    def __init__(
+        self,
+        path: t.Union[str, Path],
+        mode: str = "w",
+        encoding: t.Optional[str] = "utf-8",
+        errors: t.Optional[str] = "strict",
+        rotate_size: t.Optional[int] = None,
+        rotate_interval: t.Optional[float] = None,
+        compress: t.Optional[str] = None,
+        backups: t.Optional[int] = None,
+    ):
+        if compress is None:
+            self._compressor = None
+        elif compress in COMPRESSORS:
+            suffix, factory = COMPRESSORS[compress]
+            self._compressor = (suffix, factory())
+        else:
+            raise ValueError(
+                f"compress must be one of {list(COMPRESSORS)}, not {compress!r}."
+            )
+
+        self._path = Path(path)
+        self._encoding = encoding or "utf-8"
+        self._errors = errors or "strict"
+        self._rotate_size = rotate_size
+        self._rotate_interval = rotate_interval
+        self._backups = backups
+        self._executor = cf.ThreadPoolExecutor(1) if compress or backups else None
+        self._jobs: t.List[cf.Future] = []
+
+        self._open("ab" if "a" in mode else "wb")
+
+    @property
+    def encoding(self) -> str:  # type: ignore[override]
+        return self._encoding
+
+    @property
+    def errors(self) -> str:  # type: ignore[override]
+        return self._errors
+
+    def writable(self) -> bool:
+        return True
+
+    def _open(self, mode: str) -> None:
+        self._file = open(self._path, mode)
+        self._size = self._file.seek(0, io.SEEK_END)
+        self._opened = time.monotonic()
+
+    def segments(self) -> t.List[t.Tuple[int, Path]]:
+        """Returns the index and path of the rotated segments, oldest first."""
+
+        prefix = f"{self._path.name}."
+        segments = []
+
+        for file in self._path.parent.glob(f"{prefix}*"):
+            index = file.name.removeprefix(prefix).split(".")[0]
+
+            if index.isdigit():
+                segments.append((int(index), file))
+
+        return sorted(segments)
+
+    def rotate(self) -> None:
+        """Closes the current file, renames it to the next segment and reopens it."""
+
+        self._file.close()
+
+        segments = self.segments()
+        index = segments[-1][0] + 1 if segments else 1
+        segment = self._path.with_name(f"{self._path.name}.{index}")
+
+        os.replace(self._path, segment)
+
+        if self._executor is not None:
+            self._jobs.append(self._executor.submit(self._finish, index, segment))
+
+        self._open("wb")
+
+    def _finish(self, index: int, segment: Path) -> None:
+        if self._compressor is not None:
+            suffix, compressor = self._compressor
+
+            with segment.open("rb") as src:
+                with compressor(segment.with_name(segment.name + suffix)) as dst:
+                    shutil.copyfileobj(src, dst, 2**20)
+
+            segment.unlink()
+
+        if self._backups is not None:
+            segments = [s for s in self.segments() if s[0] <= index]
+
+            for _, file in segments[: max(len(segments) - self._backups, 0)]:
+                file.unlink(missing_ok=True)
+
+    def write(self, s: str) -> int:
+        data = s.encode(self._encoding, self._errors)
+
+        if self._size and (
+            (self._rotate_size and self._size + len(data) > self._rotate_size)
+            or (
+                self._rotate_interval
+                and time.monotonic() - self._opened >= self._rotate_interval
+            )
+        ):
+            self.rotate()
+
+        self._file.write(data)
+        self._size += len(data)
+
+        return len(s)
+
+    def flush(self) -> None:
+        if not self._file.closed:
+            self._file.flush()
+
+    def close(self) -> None:
+        if not self.closed:
+            try:
+                self._file.close()
+
+                for job in self._jobs:
+                    job.result()
+            finally:
+                if self._executor is not None:
+                    self._executor.shutdown()
+
+                super().close()
+
+
+def buffered(stream: t.IO[str], buffer_size: int = 2**20) -> t.IO[str]:
+    """
+    Returns a text stream writing to the same file as `stream` with a buffer of
+    `buffer_size` bytes, or a `BufferedWriter` if the stream has no file descriptor.
+    """
+
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError):
+        return t.cast(t.IO[str], BufferedWriter(stream, buffer_size))
+
+    stream.flush()
+
+    return open(
+        fd,
+        "w",
+        buffering=buffer_size,
+        encoding=getattr(stream, "encoding", None),
+        errors=getattr(stream, "errors", None),
+        closefd=False,
+    )
+
+
+WRITERS: t.Dict[str, t.Callable[..., t.Any]] = {
+    "buffered": buffered,
+    "thread": ThreadedWriter,
+}
@@ -0,0 +1,115 @@
+import asyncio
+
+import click
+import pytest
+from click.testing import CliRunner
+
+import clickx
+from clickx import aio
+
+
+def test_asynchronous(tmp_path):
+    file = tmp_path / "output.txt"
+
+    @click.command()
+    @click.argument("values", nargs=-1)
+    @clickx.traceback
+    @clickx.redirect
+    @clickx.asynchronous(concurrency=2)
+    async def cli(values):
+        async def echo(value):
+            await asyncio.sleep(0.01)
+            return value.upper()
+
+        for value in await clickx.gather(*map(echo, values)):
+            click.echo(value)
+
+        return len(values)
+
+    runner = CliRunner(mix_stderr=False)
+    result = runner.invoke(cli, ["a", "b", "c", "--redirect", str(file)])
+
+    assert result.exit_code == 3
+    assert file.read_text().splitlines() == ["A", "B", "C"]
+
+
+def test_asynchronous_traceback():
+
+    @click.command()
+    @clickx.traceback(exitcode=5)
+    async def cli():
+        await asyncio.sleep(0)
+        raise ValueError("async")
+
+    runner = CliRunner(mix_stderr=False)
+    result = runner.invoke(cli)
+
+    assert result.exit_code == 5
+    assert "ValueError('async')" in result.stderr
+
+
+def test_asynchronous_interrupt():
+    finished = []
+
+    async def background():
+        try:
+            await asyncio.sleep(10)
+        finally:
+            finished.append(True)
+
+    @click.command()
+    @clickx.traceback
+    @clickx.asynchronous
+    async def cli():
+        asyncio.create_task(background())
+        await asyncio.sleep(0.01)
+        raise KeyboardInterrupt
+
+    runner = CliRunner(mix_stderr=False)
+    result = runner.invoke(cli)
+
+    assert result.exit_code == 3
+    assert finished == [True]
+
+
+def test_asynchronous_coroutine():
+
+    with pytest.raises(TypeError):
+        clickx.asynchronous(lambda: None)
+
+
+@pytest.mark.parametrize("limit", [None, 1, 3])
+def test_gather(limit):
+    running = []
+    peak = []
+
+    async def task(value):
+        running.append(value)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(value)
+        return value
+
+    results = aio.run(clickx.gather(*map(task, range(6)), limit=limit))
+
+    assert results == list(range(6))
+    assert max(peak) == (limit or 6)
+
+
+def test_gather_cancel():
+    cancelled = []
+
+    async def task(value):
+        try:
+            await asyncio.sleep(0.01 * value)
+        except asyncio.CancelledError:
+            cancelled.append(value)
+            raise
+
+        if value == 1:
+            raise ValueError(value)
+
+    with pytest.raises(ValueError):
+        aio.run(clickx.gather(*map(task, range(1, 4))))
+
+    assert sorted(cancelled) == [2, 3]
@@ -0,0 +1,91 @@
+import pytest
+from PIL import Image
+
+from clickx.cache import IconCache
+from clickx.cli import icon
+from clickx.cli import icons
+
+
+@pytest.fixture
+def tmp_cache(tmp_path):
+    """Fixture for a temporary cache directory."""
+    return tmp_path / "cache"
+
+
+def test_cache_miss(tmp_cache):
+
+    cache = IconCache(tmp_cache)
+
+    assert cache.get(cache.key(b"source")) is None
+
+
+def test_cache_put_get(tmp_cache):
+
+    cache = IconCache(tmp_cache)
+    key = cache.key(b"source", (64,), "11.3.0")
+
+    cache.put(key, b"icon")
+
+    assert cache.get(key) == b"icon"
+    assert [file.name for file in tmp_cache.iterdir()] == [key]
+
+
+def test_cache_key():
+
+    assert IconCache.key(b"source", (64,)) != IconCache.key(b"source", (128,))
+    assert IconCache.key(b"source", (64,)) == IconCache.key(b"source", (64,))
+
+
+def test_cache_evict(tmp_cache):
+
+    cache = IconCache(tmp_cache, max_size=8)
+
+    cache.put("first", b"1234")
+    cache.put("second", b"5678")
+    cache.get("first")
+    cache.put("third", b"90")
+
+    assert cache.get("first") == b"1234"
+    assert cache.get("second") is None
+    assert cache.get("third") == b"90"
+
+
+def test_icon_cache(tmp_path, tmp_cache, mocker):
+
+    ico = tmp_path / "clickx.ico"
+
+    assert icon("clickx.png", icon=str(ico), cache=str(tmp_cache)) == 1
+    content = ico.read_bytes()
+    ico.unlink()
+
+    spy = mocker.patch("PIL.Image.open")
+
+    assert icon("clickx.png", icon=str(ico), cache=str(tmp_cache)) == 1
+    assert icon("clickx.png", icon=str(ico), cache=str(tmp_cache)) == 0
+    assert ico.read_bytes() == content
+    spy.assert_not_called()
+
+
+def test_cache_concurrent(tmp_path, tmp_cache):
+    """Entries stored by parallel workers are all evicted by the size limit."""
+
+    pictures = tmp_path / "pictures"
+    pictures.mkdir()
+
+    for i in range(8):
+        Image.new("RGB", (64, 64), (i * 30, 0, 0)).save(pictures / f"{i}.png")
+
+    kwargs = {"cache": str(tmp_cache), "size": (64,), "jobs": 4}
+
+    assert icons([str(pictures)], **kwargs) == 1
+
+    sizes = [file.stat().st_size for file in tmp_cache.iterdir()]
+    assert len(sizes) == 8
+
+    for file in pictures.glob("*.ico"):
+        file.unlink()
+
+    IconCache(tmp_cache, max_size=sum(sizes) // 2).evict()
+
+    total = sum(file.stat().st_size for file in tmp_cache.iterdir())
+    assert 0 < total <= sum(sizes) // 2
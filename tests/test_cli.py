@@ -1,8 +1,12 @@
+import json
+from pathlib import Path
+
 import pytest
 from click.testing import CliRunner
 
 from clickx.__main__ import cli
 from clickx.cli import icon
+from clickx.cli import pictures
 
 
 @pytest.fixture
@@ -66,3 +70,88 @@ def test_icon_no_file(capsys, tmp_icon, mocker):
 
     assert result == 1
     assert str(tmp_icon) in stdout
+
+
+@pytest.fixture
+def tmp_pictures(tmp_path):
+    """Fixture to create a directory with multiple pictures."""
+
+    for name in ("a.png", "b.png", "c.png"):
+        (tmp_path / name).write_bytes(Path("clickx.png").read_bytes())
+
+    return tmp_path
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+@pytest.mark.parametrize(
+    "pattern",
+    ["", "*.png"],
+    ids=["directory", "glob"],
+)
+def test_cli_icon_batch(tmp_pictures, pattern, jobs) -> None:
+    """Test the icon command with multiple pictures."""
+
+    command = ["icon", "--jobs", jobs, str(tmp_pictures / pattern)]
+
+    runner = CliRunner(mix_stderr=False)
+    result = runner.invoke(cli, command)
+
+    assert result.exit_code == 1
+    assert result.stdout.splitlines() == [
+        str(tmp_pictures / f"{name}.ico") for name in "abc"
+    ]
+    assert result.stderr.count("exitcode 1") == 3
+
+    result = runner.invoke(cli, command)
+    assert result.exit_code == 0
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_cli_icon_batch_error(tmp_pictures, jobs) -> None:
+    """Test that a corrupt picture fails alone and the others are converted."""
+
+    tmp_pictures.joinpath("b.png").write_bytes(b"corrupt")
+    manifest = tmp_pictures / "manifest.json"
+
+    runner = CliRunner(mix_stderr=False)
+    result = runner.invoke(
+        cli, ["icon", "-j", jobs, "--manifest", str(manifest), str(tmp_pictures)]
+    )
+
+    assert result.exit_code == 3
+    assert result.stdout.splitlines() == [
+        str(tmp_pictures / f"{name}.ico") for name in "ac"
+    ]
+    assert "UnidentifiedImageError" in result.stderr
+    assert "b.png: exitcode 3" in result.stderr
+    assert len(json.loads(manifest.read_text())) == 2
+
+
+def test_cli_icon_batch_icon(tmp_pictures, tmp_icon) -> None:
+    """Test that the icon option is rejected for multiple pictures."""
+
+    runner = CliRunner(mix_stderr=False)
+    for command in (
+        ["icon", "--icon", str(tmp_icon), str(tmp_pictures)],
+        ["icon", str(tmp_pictures), "--icon", str(tmp_icon)],
+    ):
+        result = runner.invoke(cli, command)
+
+        assert result.exit_code == 2
+        assert "requires a single picture" in result.stderr
+
+
+def test_cli_icon_missing(tmp_path) -> None:
+    """Test that a missing picture is a usage error."""
+
+    runner = CliRunner(mix_stderr=False)
+    result = runner.invoke(cli, ["icon", str(tmp_path / "missing.png")])
+
+    assert result.exit_code == 2
+    assert "No pictures found" in result.stderr
+
+
+def test_pictures_not_found(tmp_path) -> None:
+
+    with pytest.raises(FileNotFoundError):
+        pictures([str(tmp_path / "*.png")])
@@ -0,0 +1,181 @@
+import io
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from clickx.client import address
+from clickx.client import main
+from clickx.client import request
+from clickx.client import Unreachable
+from clickx import metadata
+from clickx import resources
+from clickx.daemon import refresh
+from clickx.resources import ResourceIndex
+from clickx.daemon import run
+from clickx.daemon import stale
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="no unix sockets"
+)
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Fixture to start a daemon listening on a temporary socket."""
+
+    path = str(tmp_path / "clickx.sock")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "clickx", "daemon", "--socket", path, "-j", "1"],
+        stderr=subprocess.PIPE,
+    )
+
+    deadline = time.monotonic() + 10
+
+    while not os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    yield path
+
+    process.terminate()
+    process.wait(10)
+
+    assert not os.path.exists(path)
+
+
+def test_address(monkeypatch):
+    monkeypatch.setenv("CLICKX_SOCKET", "clickx.sock")
+
+    assert address() == "clickx.sock"
+
+    monkeypatch.delenv("CLICKX_SOCKET")
+    monkeypatch.setenv("XDG_RUNTIME_DIR", "runtime")
+
+    assert address().startswith(os.path.join("runtime", "clickx-"))
+
+
+def test_run(tmp_path):
+    cwd = os.getcwd()
+    environ = dict(os.environ)
+
+    exitcode, stdout, stderr = run(["--version"], str(tmp_path), {"CLICKX_X": "1"})
+
+    assert exitcode == 0
+    assert "version" in stdout
+    assert stderr == ""
+    assert os.getcwd() == cwd
+    assert dict(os.environ) == environ
+
+
+def test_run_error():
+    exitcode, stdout, stderr = run(["icon", "missing.png"])
+
+    assert exitcode == 2
+    assert "No pictures found" in stderr
+
+
+def test_daemon(daemon, tmp_path):
+    file = tmp_path / "clickx.ico"
+    argv = ["icon", "--icon", str(file), "clickx.png"]
+
+    for expected in (1, 0):
+        stdout, stderr = io.StringIO(), io.StringIO()
+
+        assert request(argv, daemon, stdout, stderr) == expected
+        assert stdout.getvalue() == f"{file}\n"
+
+    exitcode, _, stderr = run(["daemon", "--socket", daemon])
+
+    assert exitcode == 2
+    assert "can not be started by a client" in stderr
+
+
+def test_refresh(tmp_path, monkeypatch, mocker):
+    """Memoized lookups are cleared if a request forwards another environment."""
+
+    for name in ("first", "second"):
+        ResourceIndex(tmp_path / f"{name}.json").update("dist", {"name": name})
+
+    monkeypatch.setattr("clickx.daemon._state", None)
+    monkeypatch.chdir(tmp_path)
+    spy = mocker.spy(metadata, "cache_clear")
+
+    monkeypatch.setenv("CLICKX_RESOURCES", "first.json")
+    refresh()
+    assert resources.lookup("dist", "name") == Path("first")
+    refresh()
+
+    monkeypatch.setenv("CLICKX_RESOURCES", "second.json")
+    refresh()
+    assert resources.lookup("dist", "name") == Path("second")
+
+    assert spy.call_count == 2
+
+    monkeypatch.chdir(tmp_path.parent)
+    refresh()
+
+    assert spy.call_count == 3
+
+    resources.index.cache_clear()
+
+
+def test_stale(tmp_path):
+    path = str(tmp_path / "clickx.sock")
+
+    assert not stale(path)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(path)
+
+    assert stale(path)
+
+
+def test_client_fallback(monkeypatch, capsys, tmp_path):
+    monkeypatch.setenv("CLICKX_SOCKET", str(tmp_path / "missing.sock"))
+
+    with pytest.raises(SystemExit) as e:
+        main(["--version"])
+
+    assert e.value.code == 0
+    assert "version" in capsys.readouterr().out
+
+
+def test_daemon_socket_mode(daemon):
+
+    assert os.stat(daemon).st_mode & 0o077 == 0
+
+
+def test_client_owner(daemon, monkeypatch):
+    monkeypatch.setattr(os, "getuid", lambda: os.stat(daemon).st_uid + 1)
+
+    with pytest.raises(Unreachable, match="another user"):
+        request(["--version"], daemon)
+
+
+def test_client_no_fallback(tmp_path, monkeypatch):
+    """A connection lost after the request was sent must not run the command."""
+
+    path = str(tmp_path / "clickx.sock")
+    monkeypatch.setenv("CLICKX_SOCKET", path)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(path)
+        server.listen()
+
+        def reset():
+            connection, _ = server.accept()
+            connection.recv(1024)
+            connection.close()
+
+        thread = threading.Thread(target=reset)
+        thread.start()
+
+        with pytest.raises(RuntimeError, match="without an exit code"):
+            main(["--version"])
+
+        thread.join()
@@ -0,0 +1,106 @@
+import subprocess
+import sys
+
+import click
+import pytest
+from click.testing import CliRunner
+
+import clickx
+
+
+def importtime(*args: str) -> set:
+    """Returns the names of all modules imported by a python subprocess."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    return {
+        line.rpartition("|")[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+def test_import_lazy():
+
+    modules = importtime("-c", "import clickx")
+
+    assert "clickx" in modules
+    assert modules.isdisjoint({"click", "clickx.decorators", "clickx.options"})
+
+
+@pytest.mark.parametrize("option", ["--version", "--icon"])
+def test_main_lazy(option):
+
+    code = "\n".join(
+        [
+            "import sys",
+            "from clickx.__main__ import cli",
+            f"cli(['{option}'], standalone_mode=False)",
+            "print(*sys.modules, sep='\\n')",
+        ]
+    )
+
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    modules = set(result.stdout.splitlines())
+
+    assert modules.isdisjoint({"clickx.cli", "clickx.decorators", "PIL"})
+
+
+def test_lazy_exports():
+
+    assert set(clickx.__all__) <= set(dir(clickx))
+    assert all(callable(getattr(clickx, name)) for name in clickx.__all__)
+
+    with pytest.raises(AttributeError):
+        clickx.nonexisting
+
+
+@pytest.fixture
+def group():
+
+    @click.group(
+        cls=clickx.LazyGroup,
+        lazy_subcommands={"icon": "clickx.cli.cli_icon"},
+    )
+    def cli():
+        pass
+
+    @cli.command()
+    def eager():
+        pass
+
+    return cli
+
+
+def test_lazygroup_help(group):
+
+    runner = CliRunner()
+    result = runner.invoke(group, ["--help"])
+
+    assert result.exit_code == 0
+    assert "eager" in result.output
+    assert "icon" in result.output
+
+
+def test_lazygroup_invoke(group):
+
+    group.add_lazy_command("clickx.cli.icons", "invalid")
+
+    runner = CliRunner()
+
+    result = runner.invoke(group, ["icon", "--help"])
+    assert result.exit_code == 0
+
+    result = runner.invoke(group, ["invalid"])
+    assert type(result.exception) is TypeError
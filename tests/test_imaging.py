@@ -0,0 +1,201 @@
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from PIL import Image
+
+from clickx.__main__ import cli
+from clickx.cli import icon
+from clickx.imaging import fit
+from clickx.imaging import frames
+from clickx.imaging import load
+from clickx.imaging import outputs
+
+
+@pytest.fixture
+def jpeg(tmp_path):
+    """Fixture to create a large non-square JPEG picture."""
+
+    file = tmp_path / "picture.jpg"
+    Image.new("RGB", (2048, 1024), "orange").save(file)
+
+    return file
+
+
+@pytest.mark.parametrize(
+    "size, length, expected",
+    [
+        ((512, 512), 64, (64, 64)),
+        ((2048, 1024), 256, (256, 128)),
+        ((10, 1000), 64, (1, 64)),
+    ],
+)
+def test_fit(size, length, expected):
+
+    assert fit(size, length) == expected
+
+
+@pytest.mark.parametrize("fast", [False, True])
+def test_frames(jpeg, fast, mocker):
+
+    img = Image.open(jpeg)
+    spy = mocker.spy(Image.Image, "resize")
+
+    result = frames(img, [64, 256, 128, 4096], fast=fast)
+
+    assert [f.size for f in result] == [(256, 128), (128, 64), (64, 32)]
+    assert [c.args[0].size for c in spy.call_args_list[-2:]] == [(256, 128), (128, 64)]
+
+
+def test_frames_draft(jpeg):
+
+    img = Image.open(jpeg)
+    frames(img, [64], fast=True)
+
+    assert img.size == (256, 128)
+
+
+def test_frames_empty():
+
+    assert frames(Image.new("RGBA", (32, 32)), [64]) == []
+
+
+@pytest.mark.parametrize("resample", ["nearest", "BICUBIC"])
+def test_cli_icon_resample(tmp_path, resample):
+
+    ico = tmp_path / "clickx.ico"
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        ["icon", "--fast", "--resample", resample, "--icon", str(ico), "clickx.png"],
+    )
+
+    assert result.exit_code == 1
+    assert Image.open(ico).info["sizes"] == {(64, 64), (128, 128), (256, 256)}
+
+
+@pytest.mark.parametrize(
+    "target, expected",
+    [
+        ("app.ico", ["app.ico"]),
+        ("app.icns", ["app.icns"]),
+        ("app.png", ["app-64.png", "app-128.png"]),
+        ("{size}x{size}/app.png", ["64x64/app.png", "128x128/app.png"]),
+    ],
+)
+def test_outputs(target, expected):
+
+    files = outputs(Path(target), (64, 128))
+
+    assert [path.as_posix() for path, _ in files] == expected
+
+
+def test_outputs_invalid():
+
+    with pytest.raises(ValueError):
+        outputs(Path("app.bmp"), (64,))
+
+
+def test_cli_icon_formats(tmp_path, mocker):
+
+    spy = mocker.spy(Image, "open")
+
+    targets = [
+        tmp_path / "clickx.ico",
+        tmp_path / "clickx.icns",
+        tmp_path / "{size}" / "clickx.png",
+    ]
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        [
+            "icon",
+            *(arg for target in targets for arg in ("--icon", str(target))),
+            "--size",
+            "32",
+            "--size",
+            "1024",
+            "clickx.png",
+        ],
+    )
+
+    assert result.exit_code == 1
+    spy.assert_called_once()
+
+    assert Image.open(targets[0]).info["sizes"] == {(32, 32)}
+    assert Image.open(targets[1]).size == (1024, 1024)
+    assert Image.open(tmp_path / "32" / "clickx.png").size == (32, 32)
+    assert not tmp_path.joinpath("1024").exists()
+
+
+def test_icon_source_frame(tmp_path):
+    """The unscaled source is loaded before the encoders copy it concurrently."""
+
+    file = tmp_path / "picture.png"
+    Image.linear_gradient("L").resize((1024, 1024)).convert("RGB").save(file)
+
+    targets = [str(tmp_path / name) for name in ("a.png", "b.png", "c.ico")]
+
+    for _ in range(3):
+        assert icon(str(file), icon=targets, size=(1024,)) in (0, 1)
+
+    assert Image.open(tmp_path / "a-1024.png").size == (1024, 1024)
+
+
+@pytest.mark.parametrize("suffix", [".bmp", ".ppm", ".tif"])
+def test_load_bands(tmp_path, suffix):
+    file = tmp_path.joinpath("gradient").with_suffix(suffix)
+    picture = Image.linear_gradient("L").resize((2048, 2048)).convert("RGB")
+    picture.save(file)
+
+    img = load(file, [256], 2**20)
+
+    assert img.size == (512, 512)
+    assert img.tobytes() == picture.reduce(4).tobytes()
+
+
+def test_load_budget(tmp_path):
+    file = tmp_path / "picture.png"
+    Image.new("RGB", (2048, 2048), "orange").save(file)
+
+    assert load(file, [256]).size == (2048, 2048)
+
+    with pytest.raises(MemoryError):
+        load(file, [256], 2**20)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="no resource module")
+@pytest.mark.parametrize(
+    "suffix, options",
+    [
+        (".jpg", []),
+        (".ppm", []),
+        (".ppm", ["--cache", "{tmp}/cache", "--manifest", "{tmp}/manifest.json"]),
+    ],
+)
+def test_cli_icon_memory_budget(tmp_path, suffix, options):
+    """A 8000x8000 picture decodes to 183 MiB, the budget keeps the peak RSS low."""
+
+    file = tmp_path.joinpath("picture").with_suffix(suffix)
+    Image.new("RGB", (8000, 8000), "orange").save(file)
+
+    result = subprocess.run(
+        [
+            *(sys.executable, "-m", "clickx", "icon", "-m", "32", str(file)),
+            *(option.format(tmp=tmp_path) for option in options),
+        ],
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 1, result.stderr
+
+    rss = re.search(r"peak rss: ([\d.]+) MiB", result.stderr)
+
+    assert rss is not None
+    assert float(rss.group(1)) < 100
@@ -0,0 +1,100 @@
+import json
+import sys
+
+import click
+import pytest
+from click.testing import CliRunner
+
+import clickx
+from clickx import instrumentation
+from clickx.__main__ import cli as main
+
+
+@pytest.fixture(autouse=True)
+def disable(monkeypatch):
+    """Fixture to disable the timings before and after each test."""
+
+    monkeypatch.delenv(instrumentation.ENVVAR, raising=False)
+    instrumentation.enable(None)
+    yield
+    instrumentation.enable(None)
+
+
+@pytest.fixture
+def cli():
+
+    @click.command()
+    @clickx.timings
+    @clickx.redirect
+    def cli():
+        print("print to stdout.")
+
+    return cli
+
+
+def records(text: str) -> list:
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_phase_disabled(capfd):
+
+    with instrumentation.phase("disabled"):
+        pass
+
+    assert capfd.readouterr().err == ""
+
+
+def test_timings_flag(cli, capfd, tmp_path):
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--timings", "--redirect", str(tmp_path / "log")])
+
+    assert result.exit_code == 0
+
+    phases = {r["phase"]: r for r in records(capfd.readouterr().err)}
+
+    assert set(phases) == {"command", "redirect.flush"}
+    assert phases["command"]["command"] == "cli"
+    assert phases["command"]["duration_ns"] >= phases["redirect.flush"]["duration_ns"]
+    assert instrumentation.target() is None
+
+
+def test_timings_envvar(tmp_path, monkeypatch):
+
+    file = tmp_path / "timings.jsonl"
+    monkeypatch.setenv(instrumentation.ENVVAR, str(file))
+
+    runner = CliRunner()
+
+    for option in ("--icon", "--version"):
+        result = runner.invoke(main, [option])
+        assert result.exit_code == 0
+
+    phases = [r["phase"] for r in records(file.read_text())]
+
+    assert phases == ["convert", "version"]
+
+
+def test_timings_icon(tmp_path, capfd):
+
+    runner = CliRunner()
+    result = runner.invoke(
+        main,
+        ["icon", "--timings", "--icon", str(tmp_path / "clickx.ico"), "clickx.png"],
+    )
+
+    assert result.exit_code == 1
+
+    phases = [r["phase"] for r in records(capfd.readouterr().err)]
+
+    assert phases == ["icon.encode", "command"]
+
+
+def test_emit_stderr(mocker):
+
+    stream = mocker.patch.object(sys, "__stderr__")
+    instrumentation.enable("stderr")
+
+    instrumentation.emit({"phase": "test"})
+
+    stream.write.assert_called_once_with('{"phase": "test"}\n')
@@ -0,0 +1,16 @@
+from clickx import jsonfile
+
+
+def test_jsonfile(tmp_path):
+    file = tmp_path / "nested" / "data.json"
+
+    assert jsonfile.load(file) == {}
+
+    jsonfile.dump(file, {"key": ["value"]})
+
+    assert jsonfile.load(file) == {"key": ["value"]}
+    assert [f.name for f in file.parent.iterdir()] == ["data.json"]
+
+    file.write_text("{invalid")
+
+    assert jsonfile.load(file) == {}
@@ -0,0 +1,182 @@
+import json
+import multiprocessing
+import os
+import shutil
+
+import pytest
+from PIL import Image
+
+from clickx import jsonfile
+from clickx.cli import icon
+from clickx.cli import icons
+from clickx.manifest import digest
+from clickx.manifest import Manifest
+from clickx.manifest import outdated
+
+
+@pytest.fixture
+def files(tmp_path):
+    """Fixture for a source and an output file."""
+
+    source, output = tmp_path / "source.png", tmp_path / "output.ico"
+    source.write_bytes(b"source")
+    output.write_bytes(b"output")
+
+    return source, output
+
+
+def test_manifest_stale(tmp_path, files):
+    source, output = files
+    file = tmp_path / "manifest.json"
+
+    manifest = Manifest(file)
+    assert manifest.stale(source, output, "options")
+
+    manifest.record(source, output, "options", digest(b"source"), digest(b"output"))
+    manifest.save()
+
+    manifest = Manifest(file)
+    assert not manifest.stale(source, output, "options")
+    assert manifest.stale(source, output, "other")
+
+    os.utime(source, ns=(0, 0))
+    assert manifest.stale(source, output, "options")
+    assert manifest.unchanged(source, output, "options")
+    assert not manifest.stale(source, output, "options")
+
+    source.write_bytes(b"changed")
+    assert manifest.stale(source, output, "options")
+    assert not manifest.unchanged(source, output, "options")
+
+
+def test_manifest_merge(tmp_path, files):
+    source, output = files
+    file = tmp_path / "manifest.json"
+
+    first, second = Manifest(file), Manifest(file)
+
+    first.record(source, output, "first", "", "")
+    second.record(source, output.with_suffix(".png"), "second", "", "")
+
+    first.save()
+    second.save()
+
+    manifest = Manifest(file)
+    assert not manifest.stale(source, output, "first")
+    assert not manifest.stale(source, output.with_suffix(".png"), "second")
+
+
+def _save(file, index, barrier):
+    manifest = Manifest(file)
+    source = file.with_name("source.png")
+
+    for i in range(16):
+        manifest.record(source, file.with_name(f"{index}-{i}.ico"), "", "", "")
+
+    barrier.wait()
+    manifest.save()
+
+
+def test_manifest_concurrent(tmp_path):
+    """Processes saving into the same manifest keep the entries of each other."""
+
+    file = tmp_path / "manifest.json"
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(8)
+
+    processes = [
+        context.Process(target=_save, args=(file, index, barrier)) for index in range(8)
+    ]
+
+    for process in processes:
+        process.start()
+
+    for process in processes:
+        process.join()
+
+    assert len(json.loads(file.read_text())) == 8 * 16
+
+
+def test_outdated(files):
+    source, output = files
+
+    assert outdated(source, output.with_suffix(".png"))
+
+    os.utime(output, ns=(0, 0))
+    assert outdated(source, output)
+
+    os.utime(source, ns=(0, 0))
+    assert not outdated(source, output)
+
+
+def test_icon_manifest(tmp_path, capsys):
+    picture = tmp_path / "clickx.png"
+    shutil.copyfile("clickx.png", picture)
+
+    target = tmp_path / "clickx.ico"
+    kwargs = {"icon": str(target), "manifest": str(tmp_path / "manifest.json")}
+
+    assert icon(str(picture), check=True, **kwargs) == 1
+    assert not target.exists()
+
+    assert icon(str(picture), **kwargs) == 1
+    assert icon(str(picture), check=True, **kwargs) == 0
+    assert icon(str(picture), **kwargs) == 0
+
+    capsys.readouterr()
+
+    assert icon(str(picture), size=(32,), check=True, **kwargs) == 1
+    assert capsys.readouterr().out == f"{target}\n"
+
+    os.utime(target, ns=(0, 0))
+    assert icon(str(picture), check=True, **kwargs) == 1
+    assert capsys.readouterr().out == f"{target}\n"
+
+    assert icon(str(picture), **kwargs) == 0
+    assert capsys.readouterr().out == ""
+
+
+def test_icon_check(tmp_path):
+    target = tmp_path / "clickx.ico"
+
+    assert icon("clickx.png", icon=str(target), check=True) == 1
+    assert icon("clickx.png", icon=str(target)) == 1
+    assert icon("clickx.png", icon=str(target), check=True) == 0
+
+
+def test_icons_manifest_jobs(tmp_path, capsys):
+    """Entries recorded by parallel workers are all saved into the manifest."""
+
+    pictures = tmp_path / "pictures"
+    pictures.mkdir()
+
+    for i in range(16):
+        Image.new("RGB", (64, 64), (i * 15, 0, 0)).save(pictures / f"{i}.png")
+
+    file = tmp_path / "manifest.json"
+    kwargs = {"size": (64,), "jobs": 4, "manifest": str(file)}
+
+    assert icons([str(pictures)], **kwargs) == 1
+    assert len(json.loads(file.read_text())) == 16
+
+    capsys.readouterr()
+
+    assert icons([str(pictures)], check=True, **kwargs) == 0
+    assert capsys.readouterr().out == ""
+
+
+def test_icons_manifest_loaded_once(tmp_path, mocker):
+    pictures = tmp_path / "pictures"
+    pictures.mkdir()
+
+    for i in range(4):
+        Image.new("RGB", (64, 64), (i * 60, 0, 0)).save(pictures / f"{i}.png")
+
+    kwargs = {"size": (64,), "jobs": 1, "manifest": str(tmp_path / "manifest.json")}
+
+    assert icons([str(pictures)], **kwargs) == 1
+
+    spy = mocker.spy(jsonfile, "load")
+
+    assert icons([str(pictures)], check=True, **kwargs) == 0
+    spy.assert_called_once()
@@ -0,0 +1,64 @@
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from clickx import metadata
+from clickx.__main__ import cli
+
+
+@pytest.fixture(autouse=True)
+def clear_metadata():
+    """Fixture to reset the memoized package metadata."""
+    metadata.cache_clear()
+    yield
+    metadata.cache_clear()
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    """Fixture to write a metadata snapshot of this package."""
+
+    file = tmp_path / metadata.SNAPSHOT
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["snapshot", "click_tools", "--output", str(file)])
+
+    assert result.exit_code == 0
+    assert "click-tools" in json.loads(file.read_text())
+
+    return file
+
+
+def test_snapshot(snapshot, monkeypatch, mocker):
+    monkeypatch.setenv(metadata.SNAPSHOT_ENVVAR, str(snapshot))
+    spy = mocker.spy(metadata.importlib.metadata, "metadata")
+
+    assert metadata.version("click-tools") == "0.0.0"
+    assert metadata.homepage("Click_Tools").endswith(
+        "https://github.com/d-chris/click-tools.git"
+    )
+    spy.assert_not_called()
+
+    with pytest.raises(metadata.importlib.metadata.PackageNotFoundError):
+        metadata.metadata("nonexisting")
+
+
+def test_snapshot_frozen(snapshot, monkeypatch, mocker):
+    monkeypatch.delenv(metadata.SNAPSHOT_ENVVAR, raising=False)
+    mocker.patch("sys.frozen", True, create=True)
+    mocker.patch("sys._MEIPASS", str(snapshot.parent), create=True)
+    mocker.patch("sys.executable", "clickx.exe")
+    spy = mocker.spy(metadata.importlib.metadata, "metadata")
+
+    assert metadata.version("click_tools") == "0.0.0"
+    assert metadata.package_dir("click_tools") == Path("clickx.exe")
+    spy.assert_not_called()
+
+
+def test_snapshot_missing(tmp_path, monkeypatch):
+    monkeypatch.setenv(metadata.SNAPSHOT_ENVVAR, str(tmp_path / "missing.json"))
+
+    assert metadata.snapshot() == {}
+    assert metadata.version("click_tools") == "0.0.0"
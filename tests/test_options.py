@@ -2,31 +2,92 @@ from importlib.metadata import PackageNotFoundError
 
 import click
 import pytest
+from click.testing import CliRunner
 
 import clickx
+from clickx import metadata
+
+
+@pytest.fixture(autouse=True)
+def clear_metadata():
+    """Fixture to reset the memoized package metadata."""
+    metadata.cache_clear()
+    yield
+    metadata.cache_clear()
 
 
 def test_version() -> None:
 
-    with pytest.raises(PackageNotFoundError) as e:
+    @click.command()
+    @clickx.version("nonexisting")
+    def cli():
+        pass
 
-        @click.command()
-        @clickx.version("nonexisting")
-        def cli():
-            pass
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--version"])
 
-    assert "No package metadata was found for nonexisting" in str(e.value)
+    assert type(result.exception) is PackageNotFoundError
+    assert "No package metadata was found for nonexisting" in str(result.exception)
 
 
 def test_version_frozen(mocker):
 
     mocker.patch("sys.frozen", True, create=True)
 
-    with pytest.raises(RuntimeError) as e:
+    @click.command()
+    @clickx.version("nonexisting")
+    def cli():
+        pass
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--version"])
+
+    assert type(result.exception) is RuntimeError
+    assert "--copy-metadata=nonexisting" in str(result.exception)
+
+
+def test_version_lazy(mocker):
+
+    spy = mocker.spy(metadata.importlib.metadata, "metadata")
+
+    @click.command()
+    @clickx.version("click-tools")
+    def cli():
+        pass
+
+    runner = CliRunner()
+
+    result = runner.invoke(cli, [])
+    assert result.exit_code == 0
+    spy.assert_not_called()
+
+    for _ in range(2):
+        result = runner.invoke(cli, ["--version"])
+        assert result.exit_code == 0
+        assert "cli, version 0.0.0" in result.output
+        assert "https://github.com/d-chris/click-tools.git" in result.output
+
+    spy.assert_called_once_with("click-tools")
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({"url": "https://example.com"}, "https://example.com"),
+        ({"message": "%(package)s %(version)s"}, "click-tools 0.0.0"),
+        ({"version": "1.2.3", "prog_name": "prog"}, "prog, version 1.2.3"),
+    ],
+    ids=["url", "message", "version"],
+)
+def test_version_kwargs(kwargs, message):
+
+    @click.command()
+    @clickx.version("click-tools", **kwargs)
+    def cli():
+        pass
 
-        @click.command()
-        @clickx.version("nonexisting")
-        def cli():
-            pass
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--version"])
 
-    assert "--copy-metadata=nonexisting" in str(e.value)
+    assert result.exit_code == 0
+    assert message in result.output
@@ -0,0 +1,91 @@
+import os
+import time
+
+import click
+import pytest
+from click.testing import CliRunner
+
+import clickx
+
+
+def command(**kwargs) -> click.Command:
+    """Returns a command echoing each value, values ending with a digit exit."""
+
+    @click.command()
+    @click.argument("values", nargs=-1)
+    @clickx.traceback
+    @clickx.parallel(**kwargs)
+    def cli(values):
+        time.sleep(0.01 * (5 - len(values)))
+
+        if values == "fail":
+            raise ValueError(values)
+        if values[-1].isdigit():
+            raise SystemExit(int(values[-1]))
+
+        ctx = click.get_current_context()
+        click.echo(f"{ctx.info_name} {values} {os.getpid()}")
+        click.echo(values.upper(), err=True)
+
+    return cli
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel(executor):
+
+    runner = CliRunner(mix_stderr=False)
+    result = runner.invoke(
+        command(executor=executor),
+        ["a", "bb", "ccc", "dddd", "--jobs", "4"],
+    )
+
+    assert result.exit_code == 0
+    assert [line.split()[:2] for line in result.stdout.splitlines()] == [
+        ["cli", "a"],
+        ["cli", "bb"],
+        ["cli", "ccc"],
+        ["cli", "dddd"],
+    ]
+    assert result.stderr.splitlines() == ["A", "BB", "CCC", "DDDD"]
+
+    pids = {line.split()[2] for line in result.stdout.splitlines()}
+    assert (str(os.getpid()) in pids) is (executor == "thread")
+
+
+@pytest.mark.parametrize(
+    "values, exitcode",
+    [
+        ([], 0),
+        (["a", "fail", "b"], 3),
+        (["x4", "fail", "y1"], 4),
+    ],
+)
+def test_parallel_exitcode(values, exitcode):
+
+    runner = CliRunner(mix_stderr=False)
+    result = runner.invoke(command(), values)
+
+    assert result.exit_code == exitcode
+    assert ("ValueError('fail')" in result.stderr) is ("fail" in values)
+
+
+def test_parallel_argument():
+
+    @click.command()
+    @click.argument("files", nargs=-1)
+    @click.option("--name", multiple=True)
+    @clickx.parallel(argument="name", param_decls=["-n", "--workers"])
+    def cli(files, name):
+        click.echo(f"{files} {name}")
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["a", "--name", "b", "--name", "c", "-n", "2"])
+
+    assert result.exit_code == 0
+    assert result.output.splitlines() == ["('a',) b", "('a',) c"]
+
+
+def test_parallel_executor():
+
+    with pytest.raises(ValueError):
+        clickx.parallel(executor="interpreter")
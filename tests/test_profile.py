@@ -0,0 +1,81 @@
+import pstats
+
+import click
+import pytest
+from click.testing import CliRunner
+
+import clickx
+
+
+def busy_loop() -> int:
+    """Dummy workload to profile."""
+    return sum(i * i for i in range(200_000))
+
+
+@pytest.fixture
+def cli():
+
+    @click.command()
+    @clickx.traceback
+    @clickx.profile(interval=0.0001)
+    def cli():
+        for _ in range(5):
+            busy_loop()
+
+    return cli
+
+
+def test_profile_none(cli):
+
+    runner = CliRunner()
+    result = runner.invoke(cli)
+
+    assert result.exit_code == 0
+
+
+def test_profile_pstats(cli, tmp_path):
+
+    file = tmp_path / "cli.pstats"
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--profile", str(file)])
+
+    assert result.exit_code == 0
+
+    stats = pstats.Stats(str(file))
+
+    assert any(func == "busy_loop" for _, _, func in stats.stats)
+
+
+@pytest.mark.parametrize("suffix", [".collapsed", ".folded"])
+def test_profile_collapsed(cli, tmp_path, suffix):
+
+    file = tmp_path.joinpath("cli").with_suffix(suffix)
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--profile", str(file)])
+
+    assert result.exit_code == 0
+
+    lines = file.read_text().splitlines()
+
+    assert lines
+    assert any("busy_loop (test_profile.py)" in line for line in lines)
+    assert all(line.rpartition(" ")[-1].isdigit() for line in lines)
+
+
+def test_profile_error(tmp_path):
+
+    file = tmp_path / "cli.pstats"
+
+    @click.command()
+    @clickx.traceback
+    @clickx.profile
+    def cli():
+        raise RuntimeError("This is an error.")
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--profile", str(file)])
+
+    assert result.exit_code == 3
+    assert file.is_file()
@@ -1,3 +1,4 @@
+import io
 import os
 import sys
 
@@ -6,6 +7,8 @@ import pytest
 from click.testing import CliRunner
 
 import clickx
+from clickx.writers import Tee
+from clickx.writers import ThreadedWriter
 
 
 @pytest.fixture
@@ -181,3 +184,119 @@ def test_redirect_attrs(tmp_file):
     assert result.exit_code == 0
     assert result.output == ""
     assert "stdout" in tmp_file.read_text()
+
+
+@pytest.mark.parametrize(
+    "writer, kwargs",
+    [
+        ("buffered", {"buffer_size": 64}),
+        ("thread", {"queue_size": 4}),
+    ],
+    ids=["buffered", "thread"],
+)
+@pytest.mark.parametrize("exception", [False, True], ids=["success", "error"])
+def test_redirect_writer(writer, kwargs, exception, tmp_file):
+    """Test the redirect decorator with a writer backend."""
+
+    @click.command()
+    @clickx.redirect(writer=writer, **kwargs)
+    def cli():
+        for i in range(100):
+            print(f"line {i}")
+
+        if exception:
+            raise RuntimeError("This is an error.")
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--redirect", str(tmp_file)])
+
+    assert result.exit_code == int(exception)
+    assert result.output == ""
+
+    lines = tmp_file.read_text().splitlines()
+
+    assert lines[:100] == [f"line {i}" for i in range(100)]
+    assert ("Traceback (most recent call last):" in lines) is exception
+
+
+def test_redirect_writer_invalid():
+
+    with pytest.raises(ValueError):
+        clickx.redirect(writer="invalid")
+
+
+def test_threadedwriter_error():
+
+    class Stream(io.StringIO):
+        def write(self, s):
+            raise OSError("disk full")
+
+    writer = ThreadedWriter(Stream())
+    writer.write("line")
+
+    with pytest.raises(OSError):
+        writer.flush()
+
+    writer.close()
+
+
+@pytest.mark.parametrize("writer", [None, "buffered", "thread"])
+def test_redirect_tee(writer, tmp_path):
+    """Test the redirect decorator writing to console and multiple files."""
+
+    @click.command()
+    @clickx.redirect(stderr=True, tee=True, multiple=True, writer=writer)
+    def cli():
+        print("print to stdout.", file=sys.stdout)
+        print("print to stderr.", file=sys.stderr)
+
+    files = [tmp_path / "first.txt", tmp_path / "second.txt"]
+    args = [arg for file in files for arg in ("--redirect", str(file))]
+
+    runner = CliRunner(mix_stderr=False)
+    result = runner.invoke(cli, args)
+
+    assert result.exit_code == 0
+    assert result.stdout == "print to stdout.\n"
+    assert result.stderr == "print to stderr.\n"
+
+    for file in files:
+        assert file.read_text() == "print to stdout.\nprint to stderr.\n"
+
+
+def test_redirect_independent(tmp_path):
+    """Test stacked redirect decorators routing stdout and stderr separately."""
+
+    @click.command()
+    @clickx.redirect(tee=True)
+    @clickx.redirect(stdout=False, stderr=True, param_decls=["--errors"])
+    def cli():
+        print("print to stdout.", file=sys.stdout)
+        print("print to stderr.", file=sys.stderr)
+
+    out, err = tmp_path / "stdout.txt", tmp_path / "stderr.txt"
+
+    runner = CliRunner(mix_stderr=False)
+    result = runner.invoke(cli, ["--redirect", str(out), "--errors", str(err)])
+
+    assert result.exit_code == 0
+    assert result.stdout == "print to stdout.\n"
+    assert result.stderr == ""
+    assert out.read_text() == "print to stdout.\n"
+    assert err.read_text() == "print to stderr.\n"
+
+
+def test_tee_encoding():
+    """Test the tee stream with different encodings and text streams."""
+
+    utf8 = io.TextIOWrapper(io.BytesIO(), encoding="utf-8", line_buffering=True)
+    latin = io.TextIOWrapper(io.BytesIO(), encoding="latin-1", errors="replace")
+    text = io.StringIO()
+
+    tee = Tee(utf8, latin, text)
+    tee.write("ä €\n")
+    tee.flush()
+
+    assert utf8.buffer.getvalue() == "ä €\n".encode()
+    assert latin.buffer.getvalue() == b"\xe4 ?\n"
+    assert text.getvalue() == "ä €\n"
@@ -0,0 +1,96 @@
+from pathlib import Path
+
+import click
+import pytest
+from click.testing import CliRunner
+
+import clickx
+from clickx import resources
+from clickx.__main__ import cli
+from clickx.resources import ResourceIndex
+
+
+@pytest.fixture
+def package(tmp_path):
+    """Fixture for a package directory with resources."""
+
+    directory = tmp_path / "package"
+    directory.joinpath("icons").mkdir(parents=True)
+    directory.joinpath("icons", "app.ico").write_bytes(b"icon")
+    directory.joinpath("empty.txt").write_bytes(b"")
+    directory.joinpath("__init__.py").write_text("")
+
+    return directory
+
+
+@pytest.fixture
+def clear_index():
+    """Fixture to reset the memoized resource index."""
+    resources.index.cache_clear()
+    yield
+    resources.index.cache_clear()
+
+
+@pytest.mark.parametrize("relative", [False, True])
+def test_resource_index(tmp_path, package, relative):
+    file = tmp_path / "bundle" / resources.RESOURCES
+
+    entries = ResourceIndex.build(
+        package, ["*.ico", "*.txt"], file.parent if relative else None
+    )
+    ResourceIndex(file).update("My_Package", entries)
+
+    index = ResourceIndex(file)
+    path = index.lookup("my-package", "icons/app.ico")
+
+    assert set(entries) == {"icons/app.ico", "empty.txt"}
+    assert Path(entries["icons/app.ico"]).is_absolute() is not relative
+    assert path.resolve() == package.joinpath("icons", "app.ico").resolve()
+    assert index.lookup("my-package", "missing.ico") is None
+
+    with index.open("my-package", "icons/app.ico") as data:
+        assert data[:] == b"icon"
+
+    with index.open("my-package", "empty.txt") as data:
+        assert data == b""
+
+    with pytest.raises(KeyError):
+        with index.open("my-package", "missing.ico"):
+            pass
+
+
+def test_packageicon_index(tmp_path, package, monkeypatch, mocker, clear_index):
+    file = tmp_path / resources.RESOURCES
+    ResourceIndex(file).update("my-package", ResourceIndex.build(package))
+
+    monkeypatch.setenv(resources.RESOURCES_ENVVAR, str(file))
+    spy = mocker.patch("clickx.types.package_dir")
+
+    @click.command()
+    @clickx.icon("icons/app.ico", "my-package")
+    def command():
+        pass
+
+    runner = CliRunner(mix_stderr=False)
+    result = runner.invoke(command, ["--icon"])
+
+    assert result.exit_code == 0
+    assert Path(result.stderr.strip()) == package.joinpath("icons", "app.ico")
+    spy.assert_not_called()
+
+
+def test_cli_resources(tmp_path, clear_index, monkeypatch):
+    file = tmp_path / resources.RESOURCES
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        ["resources", "click_tools", "--pattern", "*.ico", "--output", str(file)],
+    )
+
+    assert result.exit_code == 0
+
+    monkeypatch.setenv(resources.RESOURCES_ENVVAR, str(file))
+
+    assert resources.lookup("click-tools", "clickx.ico").is_file()
+    assert resources.lookup("click-tools", "__init__.py") is None
@@ -1,8 +1,15 @@
+import importlib.metadata
+import json
 from pathlib import Path
 
 import pytest
 
+import clickx.sitepackage
+from clickx.sitepackage import _dist_info
+from clickx.sitepackage import _packages
+from clickx.sitepackage import INDEX_ENVVAR
 from clickx.sitepackage import module_name
+from clickx.sitepackage import SitepackageIndex
 from clickx.sitepackage import sitepackage_dir
 
 
@@ -39,3 +46,102 @@ def test_module_name_not_found():
 
     with pytest.raises(ModuleNotFoundError):
         module_name("nonexistent-package")
+
+
+@pytest.fixture
+def clear_cache():
+    """Fixture to reset the memoized package directories."""
+    sitepackage_dir.cache_clear()
+    yield
+    sitepackage_dir.cache_clear()
+
+
+def test_sitepackage_dir_memoized(clear_cache, mocker):
+
+    spy = mocker.spy(clickx.sitepackage, "_sitepackage_dir")
+
+    assert sitepackage_dir("pip") == sitepackage_dir("pip")
+    spy.assert_called_once_with("pip")
+
+
+def test_sitepackage_index(clear_cache, tmp_path, monkeypatch, mocker):
+
+    index = tmp_path / "index.json"
+    monkeypatch.setenv(INDEX_ENVVAR, str(index))
+
+    expected = sitepackage_dir("pip")
+    assert "pip" in json.loads(index.read_text())
+
+    sitepackage_dir.cache_clear()
+    spy = mocker.spy(clickx.sitepackage, "_sitepackage_dir")
+
+    assert SitepackageIndex(index).resolve("pip") == expected
+    spy.assert_not_called()
+
+
+def test_sitepackage_index_invalidated(tmp_path):
+
+    index = tmp_path / "index.json"
+    index.write_text(json.dumps({"pip": {"version": "0", "mtime": 0, "path": ""}}))
+
+    assert SitepackageIndex(index).resolve("pip") == sitepackage_dir("pip")
+    assert json.loads(index.read_text())["pip"]["version"] != "0"
+
+
+def test_sitepackage_index_module(tmp_path):
+
+    index = tmp_path / "index.json"
+
+    assert SitepackageIndex(index).resolve("clickx") == Path("clickx").resolve()
+    assert not index.exists()
+
+
+@pytest.fixture
+def tmp_dist(tmp_path):
+    """Fixture to create a distribution with a package not named like the dist."""
+
+    package = tmp_path / "site" / "vendored"
+    package.mkdir(parents=True)
+    package.joinpath("__init__.py").touch()
+
+    info = tmp_path / "site" / "vendored_sdk-1.0.dist-info"
+    info.mkdir()
+    info.joinpath("METADATA").write_text("Name: vendored-sdk\nVersion: 1.0\n")
+
+    return importlib.metadata.PathDistribution(info)
+
+
+@pytest.mark.parametrize(
+    "filename, content",
+    [
+        ("top_level.txt", "missing\nvendored\n"),
+        ("RECORD", "tests/__init__.py,,\nvendored/__init__.py,,\n"),
+    ],
+)
+def test_packages(tmp_dist, filename, content):
+
+    tmp_dist._path.joinpath(filename).write_text(content)
+
+    package = next(
+        p for p in _packages(tmp_dist) if p.joinpath("__init__.py").is_file()
+    )
+
+    assert package.name == "vendored"
+
+
+def test_packages_editable(tmp_dist):
+
+    url = tmp_dist.locate_file("").resolve().as_uri()
+    tmp_dist._path.joinpath("direct_url.json").write_text(json.dumps({"url": url}))
+
+    assert [p.name for p in _packages(tmp_dist)] == ["vendored"]
+
+
+def test_dist_info(tmp_dist):
+
+    assert _dist_info(tmp_dist) == tmp_dist.locate_file("vendored_sdk-1.0.dist-info")
+
+    tmp_dist._path.joinpath("METADATA").write_text("Name: other\nVersion: 1.0\n")
+
+    with pytest.raises(FileNotFoundError):
+        _dist_info(tmp_dist)
@@ -1,8 +1,14 @@
+import io
+import json
+import time
+import traceback as tb
+
 import click
 import pytest
 from click.testing import CliRunner
 
 import clickx
+from clickx.decorators import print_traceback
 
 
 @pytest.fixture
@@ -117,3 +123,103 @@ def test_traceback_attrs():
 
     assert result.exit_code == 0
     assert "Custom help message." in result.output
+
+
+def chained() -> BaseException:
+    """Returns an exception with a context, which has a cause."""
+
+    try:
+        try:
+            raise ValueError("root")
+        except ValueError as e:
+            raise KeyError("context") from e
+    except KeyError:
+        try:
+            raise RuntimeError("raised")
+        except RuntimeError as e:
+            return e
+
+
+def recursion(depth: int) -> None:
+    if depth:
+        recursion(depth - 1)
+    else:
+        raise RuntimeError("recursion")
+
+
+def test_print_traceback():
+
+    exception = chained()
+    stream = io.StringIO()
+
+    print_traceback(exception, file=stream)
+
+    assert stream.getvalue() == "".join(tb.format_exception(exception))
+
+
+@pytest.mark.parametrize("chain, count", [(0, 1), (1, 2), (2, 3), (None, 3)])
+def test_print_traceback_chain(chain, count):
+
+    stream = io.StringIO()
+
+    print_traceback(chained(), chain=chain, file=stream)
+    output = stream.getvalue()
+
+    assert output.count("Traceback (most recent call last):") == count
+    assert ("chained exceptions truncated" in output) is (count < 3)
+    assert "RuntimeError: raised" in output
+
+
+def test_print_traceback_long_chain():
+    """Each exception of a long chain is formatted once, not with its whole chain."""
+
+    exception: BaseException = ValueError(0)
+
+    for i in range(1, 2000):
+        try:
+            raise ValueError(i) from exception
+        except ValueError as e:
+            exception = e
+
+    stream = io.StringIO()
+
+    start = time.perf_counter()
+    print_traceback(exception, file=stream)
+    elapsed = time.perf_counter() - start
+
+    assert stream.getvalue() == "".join(tb.format_exception(exception))
+    assert elapsed < 2
+
+
+def test_print_traceback_limit():
+
+    try:
+        recursion(50)
+    except RuntimeError as e:
+        exception = e
+
+    stream = io.StringIO()
+    print_traceback(exception, limit=-2, file=stream)
+
+    assert stream.getvalue().count("File ") == 2
+    assert "raise RuntimeError" in stream.getvalue()
+
+
+def test_traceback_summary():
+
+    @click.command()
+    @clickx.traceback(summary=True, exitcode=4)
+    def cli():
+        raise RuntimeError("Error: summary")
+
+    runner = CliRunner(mix_stderr=False)
+    result = runner.invoke(cli, catch_exceptions=False)
+
+    assert result.exit_code == 4
+
+    summary = json.loads(result.stderr)
+
+    assert summary["exception"] == "RuntimeError"
+    assert summary["message"] == "Error: summary"
+    assert summary["function"] == "cli"
+    assert summary["exitcode"] == 4
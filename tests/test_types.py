@@ -1,6 +1,8 @@
+import importlib
 from pathlib import Path
 
 import click
+import pytest
 from click.testing import CliRunner
 
 import clickx
@@ -8,7 +10,7 @@ import clickx
 
 def test_packageicon(mocker):
 
-    mocker.patch("clickx.types.sitepackage_dir", return_value=Path.cwd())
+    mocker.patch("clickx.types.package_dir", return_value=Path.cwd())
 
     @click.command()
     @clickx.icon("clickx.png")
@@ -37,3 +39,120 @@ def test_packageicon_frozen(mocker):
 
     assert result.exit_code == 0
     assert "clickx.png" in result.output
+
+
+@pytest.fixture
+def mapped():
+    """Fixture for a command which returns the size and head of a mapped file."""
+
+    views = []
+
+    @click.command()
+    @click.argument("file", type=clickx.MappedFile())
+    def cli(file):
+        views.append(file)
+        click.echo(f"{file.nbytes} {bytes(file[:5])!r}")
+
+    return cli, views
+
+
+def test_mappedfile(tmp_path, mapped):
+    cli, views = mapped
+    file = tmp_path / "data.bin"
+    file.write_bytes(b"hello world")
+
+    runner = CliRunner()
+    result = runner.invoke(cli, [str(file)])
+
+    assert result.exit_code == 0
+    assert result.output == "11 b'hello'\n"
+
+    with pytest.raises(ValueError):
+        views[0].tobytes()
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [(b"", "0 b''\n"), (b"hello", "5 b'hello'\n")],
+    ids=["empty", "stdin"],
+)
+def test_mappedfile_read(tmp_path, mapped, content, expected):
+    cli, _ = mapped
+    file = tmp_path / "empty.bin"
+    file.write_bytes(content)
+
+    runner = CliRunner()
+    args = [str(file)] if not content else ["-"]
+    result = runner.invoke(cli, args, input=content)
+
+    assert result.exit_code == 0
+    assert result.output == expected
+
+
+def test_mappedfile_nofallback(tmp_path):
+
+    @click.command()
+    @click.argument("file", type=clickx.MappedFile(fallback=False))
+    def cli(file):
+        pass
+
+    runner = CliRunner(mix_stderr=False)
+
+    result = runner.invoke(cli, ["-"], input=b"hello")
+    assert result.exit_code == 2
+    assert "is not a regular file" in result.stderr
+
+    result = runner.invoke(cli, [str(tmp_path / "missing.bin")])
+    assert result.exit_code == 2
+    assert "No such file or directory" in result.stderr
+
+
+@pytest.mark.parametrize("compression", [None, "gzip", "bz2", "lzma"])
+@pytest.mark.parametrize("lines", [False, True])
+def test_streamfile(tmp_path, compression, lines):
+    content = b"first line\nsecond line\nthird\n"
+    file = tmp_path / "data.bin"
+
+    if compression is None:
+        file.write_bytes(content)
+    else:
+        file.write_bytes(importlib.import_module(compression).compress(content))
+
+    buffers = []
+
+    @click.command()
+    @click.argument("file", type=clickx.StreamFile(chunk_size=4, lines=lines))
+    def cli(file):
+        for chunk in file:
+            buffers.append(chunk.obj if isinstance(chunk, memoryview) else None)
+            click.echo(bytes(chunk).decode(), nl=False)
+
+    runner = CliRunner()
+    result = runner.invoke(cli, [str(file)])
+
+    assert result.exit_code == 0
+    assert result.output == content.decode()
+    assert len(buffers) == (3 if lines else 8)
+    assert all(buffer is buffers[0] for buffer in buffers)
+
+
+def test_streamfile_stdin(tmp_path):
+    import gzip
+
+    @click.command()
+    @click.argument("file", type=clickx.StreamFile())
+    def cli(file):
+        click.echo(b"".join(file).decode(), nl=False)
+
+    runner = CliRunner(mix_stderr=False)
+
+    result = runner.invoke(cli, ["-"], input=gzip.compress(b"compressed"))
+    assert result.exit_code == 0
+    assert result.stdout == "compressed"
+
+    result = runner.invoke(cli, ["-"], input=b"plain")
+    assert result.stdout == "plain"
+
+    result = runner.invoke(cli, [str(tmp_path / "missing.gz")])
+    assert result.exit_code == 2
+    assert "No such file or directory" in result.stderr
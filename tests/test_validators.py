@@ -1,11 +1,90 @@
+import subprocess
+import sys
+
+import click
 import pytest
+from click.testing import CliRunner
 
 
 def test_validators_missing(mocker):
 
     mocker.patch.dict("sys.modules", {"clicktypes": None})
+    sys.modules.pop("clickx.validators", None)
 
     with pytest.raises(ModuleNotFoundError) as e:
         import clickx.validators  # noqa: F401
 
     assert "pip install click-tools[validators]" in str(e.value)
+
+
+def test_validators_lazy():
+
+    code = "\n".join(
+        [
+            "import sys",
+            "import clickx.validators as v",
+            "assert 'clicktypes' not in sys.modules",
+            "assert v.email is sys.modules['clicktypes'].email",
+        ]
+    )
+
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_validators_star_import():
+    import clicktypes
+
+    namespace: dict = {}
+    exec("from clickx.validators import *", namespace)
+
+    assert set(clicktypes.__all__) <= set(namespace)
+    assert "functools" not in namespace
+
+
+@pytest.mark.parametrize(
+    "name, values, invalid",
+    [
+        ("md5", ["d41d8cd98f00b204e9800998ecf8427E"] * 3, []),
+        ("md5", ["d41d8cd98f00b204e9800998ecf8427e", "xyz", "xyz"], ["xyz", "xyz"]),
+        ("slug", ["my-slug", "my-slug\nslug"], ["my-slug\nslug"]),
+        ("email", ["a@example.com", "bogus@@", "a@example.com"], ["bogus@@"]),
+        ("md5", [], []),
+    ],
+)
+def test_batch_invalid(name, values, invalid):
+    from clickx.validators import batch
+
+    assert batch(name).invalid(values) == invalid
+
+
+def test_batch_distinct(mocker):
+    from clickx.validators import batch
+
+    validator = batch("email")
+    spy = mocker.spy(validator, "valid")
+
+    assert validator.invalid(["a@example.com"] * 100 + ["b@example.com"]) == []
+    assert spy.call_count == 2
+
+
+def test_batch_option():
+    from clickx.validators import batch
+
+    @click.command()
+    @click.option("--email", multiple=True, callback=batch("email"))
+    def cli(email):
+        click.echo(len(email))
+
+    runner = CliRunner(mix_stderr=False)
+
+    result = runner.invoke(
+        cli, ["--email", "a@example.com", "--email", "b@example.com"]
+    )
+    assert result.exit_code == 0
+    assert result.stdout == "2\n"
+
+    args = [arg for i in range(7) for arg in ("--email", f"bogus{i}@@")]
+    result = runner.invoke(cli, args)
+    assert result.exit_code == 2
+    assert "7 invalid email values" in result.stderr
+    assert "and 2 more" in result.stderr
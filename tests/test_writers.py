@@ -0,0 +1,103 @@
+import gzip
+
+import click
+import pytest
+from click.testing import CliRunner
+
+import clickx
+from clickx.writers import RotatingFile
+
+
+@pytest.fixture
+def tmp_log(tmp_path):
+    """Fixture for a temporary log file."""
+    return tmp_path / "redirect.log"
+
+
+def test_rotatingfile_size(tmp_log):
+
+    with RotatingFile(tmp_log, rotate_size=10) as f:
+        for i in range(5):
+            f.write(f"line {i}\n")
+
+    assert tmp_log.read_text() == "line 4\n"
+    assert [p.name for _, p in f.segments()] == [
+        f"redirect.log.{i}" for i in range(1, 5)
+    ]
+
+
+def test_rotatingfile_interval(tmp_log, mocker):
+
+    monotonic = mocker.patch("clickx.writers.time.monotonic", return_value=0.0)
+
+    with RotatingFile(tmp_log, rotate_interval=60) as f:
+        f.write("first\n")
+        monotonic.return_value = 30.0
+        f.write("second\n")
+        monotonic.return_value = 60.0
+        f.write("third\n")
+
+    assert tmp_log.read_text() == "third\n"
+    assert tmp_log.with_name("redirect.log.1").read_text() == "first\nsecond\n"
+
+
+def test_rotatingfile_append(tmp_log):
+
+    tmp_log.write_text("existing\n")
+
+    with RotatingFile(tmp_log, mode="a", rotate_size=12) as f:
+        f.write("appended\n")
+
+    assert tmp_log.read_text() == "appended\n"
+    assert tmp_log.with_name("redirect.log.1").read_text() == "existing\n"
+
+
+def test_rotatingfile_compress(tmp_log):
+
+    with RotatingFile(tmp_log, rotate_size=10, compress="gzip", backups=2) as f:
+        for i in range(5):
+            f.write(f"line {i}\n")
+
+    segments = [p.name for _, p in f.segments()]
+
+    assert segments == ["redirect.log.3.gz", "redirect.log.4.gz"]
+    assert gzip.decompress(tmp_log.with_name(segments[-1]).read_bytes()) == (
+        b"line 3\n"
+    )
+
+
+def test_rotatingfile_invalid(tmp_log, mocker):
+
+    with pytest.raises(ValueError):
+        RotatingFile(tmp_log, compress="invalid")
+
+    mocker.patch.dict("sys.modules", {"compression": None, "zstandard": None})
+
+    with pytest.raises(ModuleNotFoundError) as e:
+        RotatingFile(tmp_log, compress="zstd")
+
+    assert "pip install zstandard" in str(e.value)
+
+
+def test_redirect_rotate(tmp_log):
+
+    @click.command()
+    @clickx.redirect(rotate_size=64, compress="gzip", writer="buffered")
+    def cli():
+        for i in range(20):
+            print(f"line {i:>4}")
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--redirect", str(tmp_log)])
+
+    assert result.exit_code == 0
+
+    content = b"".join(
+        gzip.decompress(p.read_bytes())
+        for p in sorted(
+            tmp_log.parent.glob("*.gz"), key=lambda p: int(p.suffixes[1][1:])
+        )
+    )
+    content += tmp_log.read_bytes()
+
+    assert content.decode().splitlines() == [f"line {i:>4}" for i in range(20)]